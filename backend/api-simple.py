@@ -9,13 +9,28 @@ import os
 from datetime import datetime, timedelta
 import random
 import json
+import threading
+from collections import OrderedDict
 
 app = Flask(__name__)
 CORS(app)
 
+FORECAST_HORIZON = int(os.environ.get('FORECAST_HORIZON', 30))  # Days forecast at startup
+FORECAST_SEED = int(os.environ.get('FORECAST_SEED', 42))        # Same data and seed give the same forecasts
+FORECAST_WINDOW = 30  # Recent days the trend and spread are fitted on
+NOISE_BLOCK = 256     # Forecast steps per seeded noise stream
+PREDICT_MAX_DAYS = int(os.environ.get('PREDICT_MAX_DAYS', 3650))       # Longest days_ahead accepted by /predict
+HORIZON_CACHE_SIZE = int(os.environ.get('HORIZON_CACHE_SIZE', 16))    # Metrics whose extended forecasts are kept (LRU)
+FORECAST_METRICS = ['team_a_kills', 'team_b_kills', 'team_a_efficiency', 'team_b_efficiency', 'total_kills', 'kill_difference']
+
 # Global variables
 df = None
 forecast_data = {}
+trend_model = None  # Fitted level, trend and spread per metric, for extending forecasts on demand
+
+# metric -> unclipped random-walk path, the longest horizon generated so far
+horizon_cache = OrderedDict()
+horizon_lock = threading.Lock()
 
 def create_time_series_data():
     """Create realistic volleyball time series data for ARIMA analysis"""
@@ -71,52 +86,91 @@ def create_time_series_data():
     
     return df
 
-def simple_forecast(timeseries, steps=30):
-    """Simple forecasting using trend and seasonality"""
-    try:
-        # Get the last values
-        last_values = timeseries.tail(30).values
-        
-        # Calculate trend
-        if len(last_values) >= 2:
-            trend = np.polyfit(range(len(last_values)), last_values, 1)[0]
-        else:
-            trend = 0
-        
-        # Calculate seasonal component (weekly pattern)
-        if len(last_values) >= 7:
-            seasonal = np.mean([last_values[i] for i in range(len(last_values)-7, len(last_values)) if i >= 0])
-        else:
-            seasonal = np.mean(last_values) if len(last_values) > 0 else 0
-        
-        # Generate forecast
-        forecast = []
-        current_value = timeseries.iloc[-1]
-        
-        for i in range(steps):
-            # Add trend and some randomness
-            next_value = current_value + trend + np.random.normal(0, np.std(last_values) * 0.1)
-            forecast.append(max(next_value, 0))  # Ensure non-negative
-            current_value = next_value
-        
-        # Generate confidence intervals
-        std_dev = np.std(last_values) * 0.2
-        lower_ci = [max(f - std_dev, 0) for f in forecast]
-        upper_ci = [f + std_dev for f in forecast]
-        
-        # Generate dates
-        last_date = timeseries.index[-1]
-        dates = [last_date + timedelta(days=i+1) for i in range(steps)]
-        
-        return {
-            'forecast': forecast,
-            'lower_ci': lower_ci,
-            'upper_ci': upper_ci,
-            'dates': [d.strftime('%Y-%m-%d') for d in dates]
-        }
-    except Exception as e:
-        print(f"Forecast error: {e}")
-        return None
+def fit_trends(values):
+    """Per-column level, trend and spread of the last FORECAST_WINDOW rows of a 2-D array"""
+    window = values[-FORECAST_WINDOW:]
+    if len(window) >= 2:
+        # Least-squares slope of every column at once
+        x = np.arange(len(window)) - (len(window) - 1) / 2
+        trend = x @ (window - window.mean(axis=0)) / (x @ x)
+    else:
+        trend = np.zeros(values.shape[1])
+
+    return {
+        'last': values[-1],
+        'trend': trend,
+        'spread': window.std(axis=0)
+    }
+
+def forecast_noise(seed, start, stop, n_columns):
+    """Rows start..stop of the standard normal drift noise, one column per metric
+
+    Rows come in NOISE_BLOCK blocks, each drawn from its own seeded stream, so
+    step i has the same noise whatever the horizon and longer forecasts extend
+    shorter ones.
+    """
+    if stop <= start:
+        return np.empty((0, n_columns))
+    blocks = range(start // NOISE_BLOCK, -(-stop // NOISE_BLOCK))
+    noise = np.concatenate([np.random.RandomState([seed, block]).standard_normal((NOISE_BLOCK, n_columns)) for block in blocks])
+    offset = blocks.start * NOISE_BLOCK
+    return noise[start - offset:stop - offset]
+
+def forecast_payload(path, spread, dates):
+    """Forecast dict for one metric from its random-walk path"""
+    forecast = np.maximum(path, 0)  # Ensure non-negative
+    return {
+        'forecast': forecast.tolist(),
+        'lower_ci': np.maximum(forecast - 0.2 * spread, 0).tolist(),
+        'upper_ci': (forecast + 0.2 * spread).tolist(),
+        'dates': dates
+    }
+
+def batch_forecast(frame, steps=FORECAST_HORIZON, seed=FORECAST_SEED):
+    """Trend + drift forecast of every column of a date-indexed frame in one vectorized pass"""
+    values = frame.to_numpy(dtype=float)
+    params = fit_trends(values)
+
+    # Random walk from the last value: trend plus noise scaled to each column's recent spread
+    steps_taken = params['trend'] + 0.1 * params['spread'] * forecast_noise(seed, 0, steps, values.shape[1])
+    paths = params['last'] + np.cumsum(steps_taken, axis=0)
+
+    dates = pd.date_range(frame.index[-1] + timedelta(days=1), periods=steps, freq='D').strftime('%Y-%m-%d').tolist()
+    return {
+        metric: forecast_payload(paths[:, i], params['spread'][i], dates)
+        for i, metric in enumerate(frame.columns)
+    }
+
+def extended_forecast(metric, steps):
+    """Forecast of one metric over steps days, computing only the steps beyond its cached path
+
+    Paths in the cache are extended in whole noise blocks and never recomputed,
+    and a shorter request is a prefix of the cached path.
+    """
+    with horizon_lock:
+        path = horizon_cache.get(metric)
+        if path is not None:
+            horizon_cache.move_to_end(metric)
+
+    column = trend_model['columns'].index(metric)
+    if path is None or len(path) < steps:
+        start = 0 if path is None else len(path)
+        stop = min(-(-steps // NOISE_BLOCK) * NOISE_BLOCK, max(PREDICT_MAX_DAYS, steps))
+        noise = forecast_noise(FORECAST_SEED, start, stop, len(trend_model['columns']))[:, column]
+        level = trend_model['last'][column] if path is None else path[-1]
+        extension = level + np.cumsum(trend_model['trend'][column] + 0.1 * trend_model['spread'][column] * noise)
+        path = extension if path is None else np.concatenate([path, extension])
+
+        with horizon_lock:
+            cached = horizon_cache.get(metric)
+            if cached is None or len(cached) < len(path):
+                horizon_cache[metric] = path
+            horizon_cache.move_to_end(metric)
+            while len(horizon_cache) > HORIZON_CACHE_SIZE:
+                horizon_cache.popitem(last=False)
+
+    dates = pd.date_range(trend_model['last_date'] + timedelta(days=1), periods=steps, freq='D').strftime('%Y-%m-%d').tolist()
+    return forecast_payload(path[:steps], trend_model['spread'][column], dates)
 
 def create_simple_visualization(series_name, data, forecast_data=None, title="Time Series Analysis"):
     """Create simple visualization data"""
@@ -177,7 +231,7 @@ def create_simple_visualization(series_name, data, forecast_data=None, title="Ti
 
 def initialize_system():
     """Initialize the analytics system"""
-    global df, forecast_data
+    global df, forecast_data, trend_model
     
     try:
         # Create data directory if it doesn't exist
@@ -196,14 +250,11 @@ def initialize_system():
         
         # Generate forecasts
         print("🔮 Generating forecasts...")
-        metrics = ['team_a_kills', 'team_b_kills', 'team_a_efficiency', 'team_b_efficiency', 'total_kills', 'kill_difference']
-        
-        for metric in metrics:
-            if metric in df.columns:
-                forecast = simple_forecast(df[metric], steps=30)
-                if forecast:
-                    forecast_data[metric] = forecast
-                    print(f"✅ Forecast generated for {metric}")
+        metrics = [metric for metric in FORECAST_METRICS if metric in df.columns]
+        forecast_data.update(batch_forecast(df[metrics], steps=FORECAST_HORIZON))
+        trend_model = dict(fit_trends(df[metrics].to_numpy(dtype=float)), columns=metrics, last_date=df.index[-1])
+        horizon_cache.clear()
+        print(f"✅ Forecasts generated for {len(metrics)} metrics over {FORECAST_HORIZON} days")
         
         print("✅ Analytics system initialized successfully!")
         
@@ -226,7 +277,7 @@ def home():
         "version": "2.0.0",
         "status": "running",
         "analytics_engine": "Time Series Forecasting",
-        "forecast_horizon": "30 days",
+        "forecast_horizon": f"{FORECAST_HORIZON} days",
         "metrics_analyzed": list(forecast_data.keys()),
         "endpoints": {
             "/": "API information",
@@ -258,7 +309,8 @@ def health_check():
         "message": "AVP Beach Volleyball Analytics API is running",
         "timestamp": datetime.now().isoformat(),
         "forecasts_available": len(forecast_data),
-        "data_loaded": df is not None
+        "data_loaded": df is not None,
+        "extended_horizons": {metric: len(path) for metric, path in list(horizon_cache.items())}
     })
 
 @app.route('/timeseries')
@@ -289,7 +341,7 @@ def get_forecasts():
     
     return jsonify({
         "forecasts": forecast_data,
-        "forecast_horizon": "30 days",
+        "forecast_horizon": f"{FORECAST_HORIZON} days",
         "models_used": list(forecast_data.keys()),
         "last_update": datetime.now().isoformat()
     })
@@ -394,13 +446,21 @@ def predict():
     try:
         data = request.get_json()
         metric = data.get('metric', 'team_a_kills')
-        days_ahead = data.get('days_ahead', 7)
+        try:
+            days_ahead = int(data.get('days_ahead', 7))
+        except (TypeError, ValueError):
+            return jsonify({"error": "days_ahead must be an integer"}), 400
+        if not 1 <= days_ahead <= PREDICT_MAX_DAYS:
+            return jsonify({"error": f"days_ahead must be between 1 and {PREDICT_MAX_DAYS}"}), 400
         
         if metric not in forecast_data:
             return jsonify({"error": f"Forecast model not available for {metric}"}), 500
         
-        # Get forecast
-        forecast = forecast_data[metric]
+        # Startup forecasts cover FORECAST_HORIZON days; longer horizons are extended on demand
+        if days_ahead <= FORECAST_HORIZON:
+            forecast = forecast_data[metric]
+        else:
+            forecast = extended_forecast(metric, days_ahead)
         
         if not forecast:
             return jsonify({"error": "Forecast generation failed"}), 500
@@ -427,7 +487,7 @@ def predict():
             "model_info": {
                 "type": "Time Series Forecasting",
                 "method": "Trend + Seasonality",
-                "forecast_horizon": "30 days"
+                "forecast_horizon": f"{days_ahead} days"
             }
         })
         
@@ -1,230 +1,300 @@
 # AVP Beach Volleyball Analytics Platform - ARIMA Time Series Forecasting
 # Professional sports analytics API with ARIMA forecasting capabilities
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
 import pandas as pd
-import numpy as np
 import os
 from datetime import datetime, timedelta
 import random
 import json
-import base64
-import io
-from statsmodels.tsa.arima.model import ARIMA
-from statsmodels.tsa.stattools import adfuller
-from statsmodels.graphics.tsaplots import plot_acf, plot_pacf
-import matplotlib.pyplot as plt
-import seaborn as sns
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
+import time
+import copy
+import threading
+from forecasting import (
+    fit_and_forecast, cached_forecast, parse_prediction_args, prime_forecast_cache,
+    refilter_model, share_forecast_cache, slice_forecast
+)
+from model_cache import load_cached_model, store_cached_model, print_cache_report
+from fit_pool import run_tasks, print_timing_report
+from order_search import AUTO_ORDER, select_orders, print_order_report
+from response_cache import cached_json_response
+from visualization import create_visualization, clamp_max_points
+from dashboard_view import DashboardView
+from rollups import RollupPyramid, parse_rollup_query
+from entity_store import ENTITY_TABLE, load_entity_store
+from column_store import append_rows, load_table, save_table, table_available
+from entity_forecast import ENTITY_FORECAST_PATH, EntityForecasts
+from synthetic_data import generate_timeseries
+from metrics import init_app as init_metrics, observe_stage, timed
+from profiling import init_app as init_profiling
+from refit_scheduler import RefitScheduler
+from online_forecast import OnlineEngine
+from simulation import parse_simulation_args, simulate_wins
+from shared_arrays import describe as describe_shared_memory, share_frame
+from timeseries_query import QUERY_PARAMS, QueryError, cache_key, parse_query, query_page, stream_ndjson
+from diagnostics import PRECOMPUTE_DIAGNOSTICS, get_diagnostics, precompute_diagnostics, invalidate_diagnostics
 
 app = Flask(__name__)
 CORS(app)
+init_metrics(app)
+init_profiling(app)
 
 # Global variables
-df = None
-arima_models = {}
-forecast_data = {}
+# The data, models and forecasts requests are served from, replaced as a whole by
+# publish_snapshot() and never modified in place. Handlers read it once per request.
+snapshot = None
+_write_lock = threading.Lock()  # Serializes publishers (observations and background refits)
+entity_store = None  # Per-team long-format store, loaded on first entity request
+_entity_forecasts = {'mtime': None, 'forecasts': None}
+
+# Columnar table holding the time series; migrated once from data/volleyball_timeseries.csv
+TIMESERIES_TABLE = 'volleyball_timeseries'
+
+# Days of history generated when no data file exists; raise it to load-test with a longer series
+SYNTHETIC_DAYS = int(os.environ.get('SYNTHETIC_DAYS', 365))
+
+# gunicorn workers (gunicorn reads the same variable). Each worker serves its own snapshot and
+# writes are not coordinated between them, so the write endpoints need a single worker.
+WEB_CONCURRENCY = int(os.environ.get('WEB_CONCURRENCY', 1))
+
+# Default ARIMA orders per metric, also the fallback when automatic order selection runs out of time
+ARIMA_ORDERS = {
+    'team_a_kills': (2, 1, 2),
+    'team_b_kills': (2, 1, 2),
+    'team_a_efficiency': (1, 1, 1),
+    'team_b_efficiency': (1, 1, 1),
+    'total_kills': (2, 1, 2),
+    'kill_difference': (1, 1, 1)
+}
+
+# Horizon of the precomputed forecasts served by /forecast and /dashboard
+FORECAST_HORIZON = 30
+
+# Most items accepted in one /predict/batch request
+PREDICT_BATCH_MAX_REQUESTS = int(os.environ.get('PREDICT_BATCH_MAX_REQUESTS', 100))
+
+def refuse_uncoordinated_write():
+    """409 response when several workers would each apply a write to their own snapshot, else None"""
+    if WEB_CONCURRENCY > 1:
+        return jsonify({"error": f"Writes need a single worker (WEB_CONCURRENCY={WEB_CONCURRENCY}); restart with WEB_CONCURRENCY=1"}), 409
+    return None
 
 def create_time_series_data():
     """Create realistic volleyball time series data for ARIMA analysis"""
-    np.random.seed(42)
-    n_days = 365  # One year of daily data
-    
-    # Generate base trends with seasonality
-    dates = pd.date_range('2023-01-01', periods=n_days, freq='D')
-    
-    # Create realistic volleyball performance trends
-    base_kills = 20
-    seasonal_pattern = 5 * np.sin(2 * np.pi * np.arange(n_days) / 365)  # Yearly seasonality
-    weekly_pattern = 2 * np.sin(2 * np.pi * np.arange(n_days) / 7)      # Weekly pattern
-    trend = 0.02 * np.arange(n_days)  # Slight upward trend
-    noise = np.random.normal(0, 2, n_days)
-    
-    # Team A performance (improving over time)
-    team_a_kills = base_kills + seasonal_pattern + weekly_pattern + trend + noise
-    team_a_kills = np.maximum(team_a_kills, 5)  # Minimum 5 kills
-    
-    # Team B performance (more volatile)
-    team_b_kills = base_kills + seasonal_pattern + weekly_pattern + 0.5 * trend + 1.5 * noise
-    team_b_kills = np.maximum(team_b_kills, 5)
-    
-    # Create efficiency trends
-    team_a_efficiency = 0.7 + 0.1 * np.sin(2 * np.pi * np.arange(n_days) / 30) + 0.01 * trend + 0.05 * np.random.normal(0, 1, n_days)
-    team_a_efficiency = np.clip(team_a_efficiency, 0.3, 0.95)
-    
-    team_b_efficiency = 0.65 + 0.08 * np.sin(2 * np.pi * np.arange(n_days) / 30) + 0.005 * trend + 0.08 * np.random.normal(0, 1, n_days)
-    team_b_efficiency = np.clip(team_b_efficiency, 0.3, 0.95)
-    
-    # Create match results
-    team_a_wins = []
-    for i in range(n_days):
-        # Win probability based on performance
-        win_prob = team_a_efficiency[i] / (team_a_efficiency[i] + team_b_efficiency[i])
-        team_a_wins.append(np.random.binomial(1, win_prob))
-    
-    # Create DataFrame
-    data = {
-        'date': dates,
-        'team_a_kills': np.round(team_a_kills, 1),
-        'team_b_kills': np.round(team_b_kills, 1),
-        'team_a_efficiency': np.round(team_a_efficiency, 3),
-        'team_b_efficiency': np.round(team_b_efficiency, 3),
-        'team_a_wins': team_a_wins,
-        'total_kills': np.round(team_a_kills + team_b_kills, 1),
-        'kill_difference': np.round(team_a_kills - team_b_kills, 1)
-    }
-    
-    df = pd.DataFrame(data)
-    df.set_index('date', inplace=True)
-    
-    return df
+    return generate_timeseries(n_days=SYNTHETIC_DAYS)
 
-def check_stationarity(timeseries):
-    """Check if time series is stationary using Augmented Dickey-Fuller test"""
-    result = adfuller(timeseries.dropna())
-    return {
-        'adf_statistic': result[0],
-        'p_value': result[1],
-        'critical_values': result[4],
-        'is_stationary': result[1] < 0.05
+def publish_snapshot(df, models, forecasts, model_info, dashboard, rollups, fitted_at, cache_report=None, estimated_through=None):
+    """Swap in a new snapshot; its version keys every cached response
+
+    estimated_through maps metrics to the last live observation their models
+    were estimated on (see refit_snapshot).
+    """
+    global snapshot
+    previous = snapshot
+    share_forecast_cache()
+    snapshot = {
+        'version': previous['version'] + 1 if previous else 1,
+        'created_at': datetime.now(),
+        'fitted_at': fitted_at,
+        'df': df,
+        'models': models,
+        'forecasts': forecasts,
+        'model_info': model_info,  # Order and AIC from the last full fit, unchanged by incremental updates
+        'dashboard': dashboard,
+        'rollups': rollups,
+        'cache_report': cache_report if cache_report is not None else (previous['cache_report'] if previous else {})
     }
+    online_engine.reset(models, estimated_through)
+    return snapshot
 
-def fit_arima_model(timeseries, order=(1, 1, 1)):
-    """Fit ARIMA model to time series data"""
-    try:
-        # Remove NaN values
-        clean_series = timeseries.dropna()
-        
-        if len(clean_series) < 10:
-            return None, "Insufficient data for ARIMA modeling"
-        
-        # Fit ARIMA model
-        model = ARIMA(clean_series, order=order)
-        fitted_model = model.fit()
-        
-        return fitted_model, None
-    except Exception as e:
-        return None, str(e)
+def get_entity_store():
+    """Entity store from the entity_timeseries table, or derived from the team-level df"""
+    global entity_store
+    if entity_store is None:
+        entity_store = load_entity_store(fallback_df=snapshot['df'])
+    return entity_store
 
-def generate_forecast(model, steps=30):
-    """Generate forecast using fitted ARIMA model"""
-    try:
-        forecast = model.forecast(steps=steps)
-        conf_int = model.get_forecast(steps=steps).conf_int()
-        
-        return {
-            'forecast': forecast.tolist(),
-            'lower_ci': conf_int.iloc[:, 0].tolist(),
-            'upper_ci': conf_int.iloc[:, 1].tolist(),
-            'dates': pd.date_range(start=model.data.dates[-1] + timedelta(days=1), periods=steps, freq='D').strftime('%Y-%m-%d').tolist()
-        }
-    except Exception as e:
+def get_entity_series(entity, metric):
+    """One entity's metric from the entity store, or None when either is unknown"""
+    store = get_entity_store()
+    if store is None or not store.has_entity(entity) or metric not in store.metrics:
+        return None
+    return store.series(entity, metric)
+
+def get_entity_forecasts():
+    """Entity forecasts written by entity_forecast.py, reloaded when the file changes"""
+    if not os.path.exists(ENTITY_FORECAST_PATH):
         return None
+    mtime = os.stat(ENTITY_FORECAST_PATH).st_mtime
+    if _entity_forecasts['mtime'] != mtime:
+        _entity_forecasts['forecasts'] = EntityForecasts(ENTITY_FORECAST_PATH)
+        _entity_forecasts['mtime'] = mtime
+    return _entity_forecasts['forecasts']
 
-def create_visualization(series_name, data, forecast_data=None, title="Time Series Analysis"):
-    """Create interactive Plotly visualization"""
-    fig = go.Figure()
-    
-    # Historical data
-    fig.add_trace(go.Scatter(
-        x=data.index,
-        y=data.values,
-        mode='lines+markers',
-        name='Historical Data',
-        line=dict(color='#1f77b4', width=2),
-        marker=dict(size=4)
-    ))
-    
-    # Forecast if available
-    if forecast_data:
-        fig.add_trace(go.Scatter(
-            x=forecast_data['dates'],
-            y=forecast_data['forecast'],
-            mode='lines+markers',
-            name='Forecast',
-            line=dict(color='#ff7f0e', width=2, dash='dash'),
-            marker=dict(size=4)
-        ))
-        
-        # Confidence intervals
-        fig.add_trace(go.Scatter(
-            x=forecast_data['dates'] + forecast_data['dates'][::-1],
-            y=forecast_data['upper_ci'] + forecast_data['lower_ci'][::-1],
-            fill='toself',
-            fillcolor='rgba(255, 127, 14, 0.2)',
-            line=dict(color='rgba(255, 127, 14, 0)'),
-            name='Confidence Interval',
-            showlegend=False
-        ))
-    
-    fig.update_layout(
-        title=title,
-        xaxis_title='Date',
-        yaxis_title=series_name,
-        template='plotly_white',
-        height=500,
-        showlegend=True
-    )
-    
-    return fig.to_json()
+def fit_models(df, live=None):
+    """Load or fit a model per metric and forecast it, without touching the live snapshot
+
+    Metrics in live (metric -> live observations continuing df) are estimated
+    on df plus those observations and bypass the model cache, which only holds
+    parameters of stored data. Their models are then filtered over df alone.
+    """
+    live = live or {}
+    arima_models = {}
+    forecast_data = {}
+    cache_report = {}
+    
+    orders = dict(ARIMA_ORDERS)
+    if AUTO_ORDER:
+        series_by_metric = {metric: df[metric] for metric in ARIMA_ORDERS if metric in df.columns}
+        selected, order_report = select_orders(series_by_metric, ARIMA_ORDERS)
+        orders.update(selected)
+        print_order_report(selected, order_report)
+    
+    fit_tasks = []
+    for metric, order in orders.items():
+        if metric in live:
+            # No forecast is needed from the extended fit; it only supplies parameters
+            fit_tasks.append((metric, (metric, pd.concat([df[metric], live[metric]]), order, 1)))
+        elif metric in df.columns:
+            model = load_cached_model(metric, df[metric], order)
+            if model:
+                arima_models[metric] = model
+                cache_report[metric] = 'hit'
+                print(f"✅ ARIMA model loaded from cache for {metric}")
+            else:
+                fit_tasks.append((metric, (metric, df[metric], order)))
+    
+    # Fit and forecast cache misses in parallel, one task per metric
+    results, stats = run_tasks(fit_and_forecast, fit_tasks)
+    for metric, result in results.items():
+        if 'seconds' in result:
+            observe_stage('arima_fit', result['seconds'])
+        if result.get('model') and metric in live:
+            arima_models[metric] = refilter_model(result['model'], df[metric])
+            cache_report[metric] = 'live refit'
+            print(f"✅ ARIMA model re-estimated for {metric} with {len(live[metric])} live observations in {result['seconds']:.2f}s")
+        elif result.get('model'):
+            arima_models[metric] = result['model']
+            cache_report[metric] = 'miss'
+            store_cached_model(metric, df[metric], orders[metric], result['model'])
+            if result['forecast_arrays']:
+                prime_forecast_cache(metric, result['model'], result['forecast_arrays'])
+                forecast_data[metric] = slice_forecast(result['forecast_arrays'], FORECAST_HORIZON)
+            print(f"✅ ARIMA model trained for {metric} in {result['seconds']:.2f}s")
+        else:
+            cache_report[metric] = 'failed'
+            print(f"⚠️  Failed to train ARIMA model for {metric}: {result['error']}")
+    
+    model_info = {metric: {'order': model.model.order, 'aic': model.aic} for metric, model in arima_models.items()}
+    
+    if results:
+        print_timing_report(results, stats)
+    print_cache_report(cache_report)
+    
+    # Generate forecasts for models restored from the cache
+    print("🔮 Generating forecasts...")
+    for metric, model in arima_models.items():
+        if metric in forecast_data:
+            continue
+        forecast = cached_forecast(metric, model, steps=FORECAST_HORIZON)
+        if forecast:
+            forecast_data[metric] = forecast
+            print(f"✅ Forecast generated for {metric}")
+    
+    return arima_models, forecast_data, model_info, cache_report
 
 def initialize_arima_system():
     """Initialize the ARIMA analytics system"""
-    global df, arima_models, forecast_data
+    arima_models, forecast_data, model_info, cache_report = {}, {}, {}, {}
     
     try:
         # Create data directory if it doesn't exist
         os.makedirs('data', exist_ok=True)
         
         # Create or load time series data
-        data_path = os.path.join('data', 'volleyball_timeseries.csv')
-        if not os.path.exists(data_path):
+        df = load_table(TIMESERIES_TABLE)
+        if df is None:
             print("📊 Creating ARIMA time series data...")
             df = create_time_series_data()
-            df.to_csv(data_path)
+            save_table(df, TIMESERIES_TABLE)
             print("✅ ARIMA time series data created successfully")
         else:
-            df = pd.read_csv(data_path, index_col='date', parse_dates=True)
             print("✅ ARIMA time series data loaded successfully")
         
-        # Fit ARIMA models for different metrics
-        print("🤖 Training ARIMA models...")
+        # Map the columns from shared memory before anything holds a private copy
+        df = share_frame(df, TIMESERIES_TABLE)
         
-        metrics = {
-            'team_a_kills': (2, 1, 2),
-            'team_b_kills': (2, 1, 2),
-            'team_a_efficiency': (1, 1, 1),
-            'team_b_efficiency': (1, 1, 1),
-            'total_kills': (2, 1, 2),
-            'kill_difference': (1, 1, 1)
-        }
+        invalidate_diagnostics()
+        if PRECOMPUTE_DIAGNOSTICS:
+            print("🧪 Computing stationarity diagnostics...")
+            precompute_diagnostics({metric: df[metric] for metric in ARIMA_ORDERS if metric in df.columns})
         
-        for metric, order in metrics.items():
-            if metric in df.columns:
-                model, error = fit_arima_model(df[metric], order)
-                if model:
-                    arima_models[metric] = model
-                    print(f"✅ ARIMA model trained for {metric}")
-                else:
-                    print(f"⚠️  Failed to train ARIMA model for {metric}: {error}")
-        
-        # Generate forecasts
-        print("🔮 Generating forecasts...")
-        for metric, model in arima_models.items():
-            forecast = generate_forecast(model, steps=30)
-            if forecast:
-                forecast_data[metric] = forecast
-                print(f"✅ Forecast generated for {metric}")
+        # Fit ARIMA models for different metrics
+        print("🤖 Training ARIMA models...")
+        arima_models, forecast_data, model_info, cache_report = fit_models(df)
         
         print("✅ ARIMA analytics system initialized successfully!")
         
     except Exception as e:
         print(f"⚠️  Error initializing ARIMA system: {e}")
         # Create fallback data
-        df = create_time_series_data()
+        df = share_frame(create_time_series_data(), TIMESERIES_TABLE)
+    
+    with _write_lock:
+        publish_snapshot(df, arima_models, forecast_data, model_info, DashboardView(df), RollupPyramid(df), datetime.now(), cache_report)
+
+def refit_snapshot():
+    """Refit every model on the current data off the request path, then swap the result in
+
+    Live observations are included in the estimation, so a refit requested by
+    forecast drift re-estimates the drifting models on the data that drifted.
+    """
+    base = snapshot
+    live = {}
+    for metric, observed in online_engine.live_observations().items():
+        if metric in base['df'].columns and observed.index.equals(
+                pd.date_range(base['df'].index[-1] + timedelta(days=1), periods=len(observed), freq='D')):
+            live[metric] = observed
+    print(f"🔁 Background refit on {len(base['df'])} observations and live data for {len(live)} metrics...")
+    arima_models, forecast_data, model_info, cache_report = fit_models(base['df'], live)
+    estimated_through = {metric: observed.index[-1] for metric, observed in live.items() if metric in arima_models}
+    
+    with _write_lock:
+        current = snapshot
+        df = current['df']
+        added = len(df) - len(base['df'])
+        if added > 0:
+            # Observations arrived during the refit; advance the fresh models over them
+            new_rows = df.iloc[-added:]
+            arima_models = {metric: model.extend(new_rows[metric]) for metric, model in arima_models.items()}
+            forecast_data = {}
+            for metric, model in arima_models.items():
+                forecast = cached_forecast(metric, model, steps=FORECAST_HORIZON)
+                if forecast:
+                    forecast_data[metric] = forecast
+        
+        published = publish_snapshot(df, arima_models, forecast_data, model_info, current['dashboard'], current['rollups'], datetime.now(), cache_report,
+                                     estimated_through)
+    print(f"✅ Snapshot {published['version']} published with {len(arima_models)} models")
+
+refit_scheduler = RefitScheduler(refit_snapshot)
+
+# Kalman-filtered live state on top of the snapshot's models; drift in its errors forces a refit
+online_engine = OnlineEngine(on_drift=refit_scheduler.trigger)
+
+def current_forecast(snap, metric, steps, alpha=0.05):
+    """(forecast, current value) from the live state when the metric has live observations, else from the snapshot"""
+    live = online_engine.forecast(metric, steps, alpha)
+    if live:
+        return live
+    return cached_forecast(metric, snap['models'][metric], steps=steps, alpha=alpha), snap['df'][metric].iloc[-1]
+
+@app.before_request
+def start_refit_scheduler():
+    # Started by the first request rather than at import, so with `gunicorn --preload`
+    # each worker runs its own thread instead of one dying with the fork from the master
+    refit_scheduler.start()
 
 # Initialize ARIMA system on startup
 print("🚀 Initializing AVP Beach Volleyball ARIMA Analytics System...")
@@ -241,54 +311,72 @@ def home():
         "status": "running",
         "analytics_engine": "ARIMA Time Series Forecasting",
         "forecast_horizon": "30 days",
-        "metrics_analyzed": list(arima_models.keys()),
+        "metrics_analyzed": list(snapshot['models'].keys()),
         "endpoints": {
             "/": "API information",
             "/health": "Health check",
             "/test": "Test endpoint",
             "/timeseries": "Get time series data",
+            "/timeseries/rollup": "Weekly, monthly or season aggregates (?freq=W|M|season)",
             "/forecast": "Get ARIMA forecasts",
             "/visualization": "Get interactive visualizations",
             "/stationarity": "Check time series stationarity",
-            "/dashboard": "Dashboard with forecasts"
+            "/dashboard": "Dashboard with forecasts",
+            "/predict/batch": "Predict several metrics and horizons at once (POST)",
+            "/simulation": "Monte Carlo win probabilities and expected wins (?days=&paths=&seed=)",
+            "/entities": "List teams available for ?entity= queries",
+            "/observations": "Append new match days (POST)",
+            "/observations/live": "Apply provisional in-tournament values to the live forecasts (POST)",
+            "/metrics": "Prometheus metrics"
         }
     })
 
 @app.route('/test')
 def test():
     """Simple test endpoint"""
+    snap = snapshot
     return jsonify({
         "message": "ARIMA Backend is working!",
         "timestamp": datetime.now().isoformat(),
         "status": "success",
-        "arima_models_loaded": len(arima_models),
-        "data_loaded": df is not None,
-        "forecasts_available": len(forecast_data)
+        "arima_models_loaded": len(snap['models']),
+        "data_loaded": snap['df'] is not None,
+        "forecasts_available": len(snap['forecasts'])
     })
 
 @app.route('/health')
 def health_check():
     """Health check endpoint for Railway"""
+    snap = snapshot
+    now = datetime.now()
     return jsonify({
         "status": "healthy",
         "message": "AVP Beach Volleyball ARIMA Analytics API is running",
-        "timestamp": datetime.now().isoformat(),
-        "arima_models_loaded": len(arima_models),
-        "data_loaded": df is not None,
-        "forecasts_available": len(forecast_data)
+        "timestamp": now.isoformat(),
+        "arima_models_loaded": len(snap['models']),
+        "data_loaded": snap['df'] is not None,
+        "forecasts_available": len(snap['forecasts']),
+        "snapshot": {
+            "version": snap['version'],
+            "created_at": snap['created_at'].isoformat(),
+            "age_seconds": round((now - snap['created_at']).total_seconds(), 1),
+            "models_fitted_at": snap['fitted_at'].isoformat(),
+            "models_age_seconds": round((now - snap['fitted_at']).total_seconds(), 1),
+            "observations": len(snap['df'])
+        },
+        "refit": refit_scheduler.describe(),
+        "live": online_engine.describe(),
+        "shared_memory": describe_shared_memory(),
+        "writes_enabled": WEB_CONCURRENCY <= 1
     })
 
-@app.route('/timeseries')
-def get_timeseries():
-    """Get time series data"""
-    if df is None:
-        return jsonify({"error": "Time series data not available"}), 500
-    
+def build_timeseries_payload(df):
+    """Build the /timeseries payload"""
     # Return last 100 data points for each metric
     recent_data = df.tail(100).reset_index()
     recent_data['date'] = recent_data['date'].dt.strftime('%Y-%m-%d')
     
-    return jsonify({
+    return {
         "timeseries_data": recent_data.to_dict('records'),
         "metrics": list(df.columns),
         "total_observations": len(df),
@@ -296,39 +384,183 @@ def get_timeseries():
             "start": df.index.min().strftime('%Y-%m-%d'),
             "end": df.index.max().strftime('%Y-%m-%d')
         }
-    })
+    }
+
+def timeseries_range_response(df, cache_prefix=None, version=None, **extra):
+    """Answer a /timeseries range query on df as a JSON page or an NDJSON stream"""
+    try:
+        query = parse_query(request.args, df.columns)
+    except QueryError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    if query['format'] == 'ndjson':
+        response = Response(stream_ndjson(df, query), mimetype='application/x-ndjson')
+        response.headers['X-Total-Observations'] = str(len(df))
+        return response
+    
+    build = lambda: {**extra, **query_page(df, query)}
+    if cache_prefix is None:
+        return jsonify(build())
+    return cached_json_response(f"{cache_prefix}:{cache_key(query)}", version, build)
+
+@app.route('/timeseries')
+def get_timeseries():
+    """Get time series data
+    
+    With start, end, metrics, cursor, limit or format, answers a range query
+    instead of returning the last 100 days of every metric.
+    """
+    snap = snapshot
+    if snap['df'] is None:
+        return jsonify({"error": "Time series data not available"}), 500
+    
+    range_query = any(name in request.args for name in QUERY_PARAMS)
+    entity = request.args.get('entity')
+    if entity:
+        store = get_entity_store()
+        if store is None or not store.has_entity(entity):
+            return jsonify({"error": f"Entity {entity} not available"}), 404
+        
+        entity_data = store.frame(entity)
+        if range_query:
+            return timeseries_range_response(entity_data, entity=entity)
+        
+        recent_data = entity_data.tail(100).reset_index()
+        recent_data['date'] = recent_data['date'].dt.strftime('%Y-%m-%d')
+        
+        return jsonify({
+            "entity": entity,
+            "timeseries_data": recent_data.to_dict('records'),
+            "metrics": store.metrics,
+            "total_observations": len(entity_data)
+        })
+    
+    if range_query:
+        return timeseries_range_response(snap['df'], 'timeseries', snap['version'])
+    
+    return cached_json_response('timeseries', snap['version'], lambda: build_timeseries_payload(snap['df']))
+
+@app.route('/timeseries/rollup')
+def get_timeseries_rollup():
+    """Weekly, monthly or season aggregates from the precomputed rollup pyramid"""
+    snap = snapshot
+    if snap['df'] is None:
+        return jsonify({"error": "Time series data not available"}), 500
+    
+    try:
+        query = parse_rollup_query(request.args, snap['df'].columns)
+    except QueryError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    def build_rollup_payload():
+        return {
+            "freq": query['freq'],
+            "rollup_data": snap['rollups'].query(**query),
+            "metrics": query['metrics'],
+            "stats": query['stats'],
+            "total_observations": len(snap['df'])
+        }
+    
+    dates = [query[name].strftime('%Y-%m-%d') if query[name] is not None else '' for name in ('start', 'end')]
+    key = f"rollup:{query['freq']}:{':'.join(dates)}:{','.join(query['metrics'])}:{','.join(query['stats'])}"
+    return cached_json_response(key, snap['version'], build_rollup_payload)
+
+def build_forecast_payload(snap):
+    """Build the /forecast payload"""
+    live = online_engine.describe()
+    forecasts = dict(snap['forecasts'])
+    for metric in live:
+        forecasts[metric] = current_forecast(snap, metric, FORECAST_HORIZON)[0]
+    
+    return {
+        "forecasts": forecasts,
+        "live_metrics": live,
+        "forecast_horizon": "30 days",
+        "models_used": list(snap['models'].keys()),
+        "last_update": snap['created_at'].isoformat()
+    }
 
 @app.route('/forecast')
 def get_forecasts():
     """Get ARIMA forecasts for all metrics"""
-    if not forecast_data:
+    entity = request.args.get('entity')
+    if entity:
+        entity_forecasts = get_entity_forecasts()
+        metrics = entity_forecasts.metrics_for(entity) if entity_forecasts else []
+        if not metrics:
+            return jsonify({"error": f"Forecasts not available for entity {entity}"}), 404
+        
+        return jsonify({
+            "entity": entity,
+            "forecasts": {metric: entity_forecasts.get(entity, metric, steps=FORECAST_HORIZON) for metric in metrics},
+            "forecast_horizon": "30 days",
+            "models_used": metrics
+        })
+    
+    snap = snapshot
+    if not snap['forecasts']:
         return jsonify({"error": "Forecasts not available"}), 500
     
-    return jsonify({
-        "forecasts": forecast_data,
-        "forecast_horizon": "30 days",
-        "models_used": list(arima_models.keys()),
-        "last_update": datetime.now().isoformat()
-    })
+    return cached_json_response('forecast', (snap['version'], online_engine.version), lambda: build_forecast_payload(snap))
 
 @app.route('/visualization/<metric>')
 def get_visualization(metric):
     """Get interactive visualization for a specific metric"""
+    snap = snapshot
+    entity = request.args.get('entity')
+    if entity:
+        return get_entity_visualization(snap, entity, metric)
+    
+    df = snap['df']
     if df is None or metric not in df.columns:
         return jsonify({"error": f"Metric {metric} not available"}), 500
     
     try:
-        # Create visualization
-        title = f"ARIMA Analysis: {metric.replace('_', ' ').title()}"
-        forecast = forecast_data.get(metric)
+        max_points = clamp_max_points(request.args.get('max_points', type=int))
         
-        viz_data = create_visualization(metric, df[metric], forecast, title)
+        def build_visualization_payload():
+            # Create visualization
+            title = f"ARIMA Analysis: {metric.replace('_', ' ').title()}"
+            forecast = snap['forecasts'].get(metric)
+            
+            return {
+                "visualization": create_visualization(metric, df[metric], forecast, title, max_points),
+                "metric": metric,
+                "has_forecast": metric in snap['forecasts'],
+                "max_points": max_points
+            }
         
-        return jsonify({
-            "visualization": viz_data,
-            "metric": metric,
-            "has_forecast": metric in forecast_data
-        })
+        # Figures only change with the data or forecasts, so render each point budget once per version
+        return cached_json_response(f"visualization:{metric}:{max_points}", snap['version'], build_visualization_payload)
+        
+    except Exception as e:
+        return jsonify({"error": f"Visualization failed: {str(e)}"}), 500
+
+def get_entity_visualization(snap, entity, metric):
+    """Visualization of one entity's metric with its entity forecast, when one was fitted"""
+    series = get_entity_series(entity, metric)
+    if series is None:
+        return jsonify({"error": f"Metric {metric} not available for entity {entity}"}), 404
+    
+    try:
+        max_points = clamp_max_points(request.args.get('max_points', type=int))
+        entity_forecasts = get_entity_forecasts()
+        
+        def build_visualization_payload():
+            title = f"ARIMA Analysis: {entity} {metric.replace('_', ' ').title()}"
+            forecast = entity_forecasts.get(entity, metric, steps=FORECAST_HORIZON) if entity_forecasts else None
+            
+            return {
+                "visualization": create_visualization(metric, series, forecast, title, max_points),
+                "entity": entity,
+                "metric": metric,
+                "has_forecast": forecast is not None,
+                "max_points": max_points
+            }
+        
+        # A derived entity store follows the snapshot, and entity forecasts change with their file
+        version = (snap['version'], _entity_forecasts['mtime'])
+        return cached_json_response(f"visualization:{entity}:{metric}:{max_points}", version, build_visualization_payload)
         
     except Exception as e:
         return jsonify({"error": f"Visualization failed: {str(e)}"}), 500
@@ -336,138 +568,420 @@ def get_visualization(metric):
 @app.route('/stationarity/<metric>')
 def check_metric_stationarity(metric):
     """Check stationarity of a specific metric"""
-    if df is None or metric not in df.columns:
-        return jsonify({"error": f"Metric {metric} not available"}), 500
+    entity = request.args.get('entity')
+    if entity:
+        series = get_entity_series(entity, metric)
+        if series is None:
+            return jsonify({"error": f"Metric {metric} not available for entity {entity}"}), 404
+        diagnostics_key = f"{entity}/{metric}"
+    else:
+        df = snapshot['df']
+        if df is None or metric not in df.columns:
+            return jsonify({"error": f"Metric {metric} not available"}), 500
+        series, diagnostics_key = df[metric], metric
     
     try:
-        stationarity_result = check_stationarity(df[metric])
+        diagnostics = get_diagnostics(diagnostics_key, series)
+        stationarity_result = diagnostics['adf']
         
-        return jsonify({
+        result = {
             "metric": metric,
             "stationarity_test": stationarity_result,
+            "kpss_test": diagnostics['kpss'],
             "recommendation": "Use differencing" if not stationarity_result['is_stationary'] else "Series is stationary"
-        })
+        }
+        if entity:
+            result["entity"] = entity
+        return jsonify(result)
         
     except Exception as e:
         return jsonify({"error": f"Stationarity test failed: {str(e)}"}), 500
 
-@app.route('/dashboard')
-def get_dashboard_data():
-    """Get comprehensive dashboard data with forecasts"""
-    if df is None:
-        return jsonify({"error": "Data not available"}), 500
+def build_dashboard_payload(snap):
+    """Build the /dashboard payload"""
+    df = snap['df']
+    dashboard_view = snap['dashboard']
     
-    try:
-        # Recent performance trends
-        recent_data = df.tail(30)
-        
-        # Calculate trends
+    # Recent performance trends, read from the materialized rolling-window view
+    window_stats = {window: dashboard_view.window_stats(window) for window in dashboard_view.windows}
+    
+    def describe_trends(stats):
         trends = {}
         for metric in ['team_a_kills', 'team_b_kills', 'team_a_efficiency', 'team_b_efficiency']:
-            if metric in df.columns:
-                slope = np.polyfit(range(len(recent_data)), recent_data[metric], 1)[0]
+            if metric in stats:
+                slope = stats[metric]['slope']
                 trends[metric] = {
                     "slope": round(slope, 4),
                     "trend": "increasing" if slope > 0 else "decreasing" if slope < 0 else "stable",
-                    "current_value": round(recent_data[metric].iloc[-1], 2),
-                    "average_value": round(recent_data[metric].mean(), 2)
+                    "current_value": round(stats[metric]['current'], 2),
+                    "average_value": round(stats[metric]['mean'], 2)
                 }
+        return trends
+    
+    trends = describe_trends(window_stats[30])
+    
+    # Win rate analysis
+    if 'team_a_wins' in df.columns:
+        recent_wins, total_recent = dashboard_view.window_sum(30, 'team_a_wins')
+        win_rate = (recent_wins / total_recent) * 100
         
-        # Win rate analysis
-        if 'team_a_wins' in df.columns:
-            recent_wins = df.tail(30)['team_a_wins'].sum()
-            total_recent = len(df.tail(30))
-            win_rate = (recent_wins / total_recent) * 100
+        overall_wins = dashboard_view.total('team_a_wins')
+        overall_total = dashboard_view.count
+        overall_win_rate = (overall_wins / overall_total) * 100
+    else:
+        win_rate = 50.0
+        overall_win_rate = 50.0
+    
+    # Forecast summary
+    forecast_summary = {}
+    for metric, forecast in snap['forecasts'].items():
+        if forecast:
+            current_val = df[metric].iloc[-1]
+            forecast_val = forecast['forecast'][-1]
+            change = ((forecast_val - current_val) / current_val) * 100
             
-            overall_wins = df['team_a_wins'].sum()
-            overall_total = len(df)
-            overall_win_rate = (overall_wins / overall_total) * 100
-        else:
-            win_rate = 50.0
-            overall_win_rate = 50.0
-        
-        # Forecast summary
-        forecast_summary = {}
-        for metric, forecast in forecast_data.items():
-            if forecast:
-                current_val = df[metric].iloc[-1]
-                forecast_val = forecast['forecast'][-1]
-                change = ((forecast_val - current_val) / current_val) * 100
-                
-                forecast_summary[metric] = {
-                    "current_value": round(current_val, 2),
-                    "forecasted_value": round(forecast_val, 2),
-                    "percent_change": round(change, 2),
-                    "trend": "increasing" if change > 0 else "decreasing" if change < 0 else "stable"
-                }
-        
-        return jsonify({
-            "recent_trends": trends,
-            "win_analysis": {
-                "recent_win_rate": round(win_rate, 1),
-                "overall_win_rate": round(overall_win_rate, 1),
-                "recent_matches": 30,
-                "total_matches": len(df)
-            },
-            "forecast_summary": forecast_summary,
-            "data_summary": {
-                "total_observations": len(df),
-                "date_range": {
-                    "start": df.index.min().strftime('%Y-%m-%d'),
-                    "end": df.index.max().strftime('%Y-%m-%d')
-                },
-                "metrics_available": list(df.columns)
+            forecast_summary[metric] = {
+                "current_value": round(current_val, 2),
+                "forecasted_value": round(forecast_val, 2),
+                "percent_change": round(change, 2),
+                "trend": "increasing" if change > 0 else "decreasing" if change < 0 else "stable"
             }
-        })
+    
+    return {
+        "recent_trends": trends,
+        "trends_by_window": {str(window): describe_trends(stats) for window, stats in window_stats.items()},
+        "win_analysis": {
+            "recent_win_rate": round(win_rate, 1),
+            "overall_win_rate": round(overall_win_rate, 1),
+            "recent_matches": 30,
+            "total_matches": len(df)
+        },
+        "forecast_summary": forecast_summary,
+        "data_summary": {
+            "total_observations": len(df),
+            "date_range": {
+                "start": df.index.min().strftime('%Y-%m-%d'),
+                "end": df.index.max().strftime('%Y-%m-%d')
+            },
+            "metrics_available": list(df.columns)
+        }
+    }
+
+@app.route('/dashboard')
+def get_dashboard_data():
+    """Get comprehensive dashboard data with forecasts"""
+    if request.args.get('entity'):
+        # The dashboard compares the two teams, so it has no per-entity form
+        return jsonify({"error": "/dashboard does not take an entity; use /timeseries, /forecast, /visualization or /stationarity with ?entity="}), 400
+    
+    snap = snapshot
+    if snap['df'] is None:
+        return jsonify({"error": "Data not available"}), 500
+    
+    try:
+        return cached_json_response('dashboard', snap['version'], lambda: build_dashboard_payload(snap))
         
     except Exception as e:
         return jsonify({"error": f"Dashboard data generation failed: {str(e)}"}), 500
 
+def build_prediction(metric, forecast, current_value, info):
+    """Build the /predict payload for a metric from a forecast slice"""
+    # Calculate predictions
+    predictions = []
+    for i, (date, pred_value) in enumerate(zip(forecast['dates'], forecast['forecast'])):
+        # Percent change is undefined from zero (e.g. a lost match in the wins series)
+        change = ((pred_value - current_value) / current_value) * 100 if current_value else None
+        predictions.append({
+            "date": date,
+            "predicted_value": round(pred_value, 2),
+            "confidence_lower": round(forecast['lower_ci'][i], 2),
+            "confidence_upper": round(forecast['upper_ci'][i], 2),
+            "percent_change": round(change, 2) if change is not None else None
+        })
+    
+    return {
+        "metric": metric,
+        "current_value": round(current_value, 2),
+        "predictions": predictions,
+        "model_info": {
+            "type": "ARIMA",
+            "order": str(info['order']),
+            "aic": round(info['aic'], 2)
+        }
+    }
+
 @app.route('/predict', methods=['POST'])
 def predict():
     """Predict future performance using ARIMA models"""
     try:
-        data = request.get_json()
+        data = request.get_json() or {}
         metric = data.get('metric', 'team_a_kills')
-        days_ahead = data.get('days_ahead', 7)
+        entity = data.get('entity')
+        try:
+            days_ahead, alpha = parse_prediction_args(data)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        
+        if entity:
+            entity_forecasts = get_entity_forecasts()
+            forecast = entity_forecasts.get(entity, metric, steps=days_ahead, alpha=alpha) if entity_forecasts else None
+            if not forecast:
+                return jsonify({"error": f"Forecast not available for {entity}/{metric} up to {days_ahead} days"}), 404
+            
+            info = entity_forecasts.info(entity, metric)
+            prediction = build_prediction(metric, forecast, current_value=info['current'], info=info)
+            prediction["entity"] = entity
+            return jsonify(prediction)
         
-        if metric not in arima_models:
+        snap = snapshot
+        if metric not in snap['models']:
             return jsonify({"error": f"ARIMA model not available for {metric}"}), 500
         
-        # Generate forecast
-        forecast = generate_forecast(arima_models[metric], steps=days_ahead)
+        # Slice the cached full-horizon forecast instead of re-running the model
+        forecast, current_value = current_forecast(snap, metric, days_ahead, alpha)
         
         if not forecast:
             return jsonify({"error": "Forecast generation failed"}), 500
         
-        # Get current value
-        current_value = df[metric].iloc[-1]
-        
-        # Calculate predictions
-        predictions = []
-        for i, (date, pred_value) in enumerate(zip(forecast['dates'], forecast['forecast'])):
-            change = ((pred_value - current_value) / current_value) * 100
-            predictions.append({
-                "date": date,
-                "predicted_value": round(pred_value, 2),
-                "confidence_lower": round(forecast['lower_ci'][i], 2),
-                "confidence_upper": round(forecast['upper_ci'][i], 2),
-                "percent_change": round(change, 2)
-            })
+        return jsonify(build_prediction(metric, forecast, current_value, snap['model_info'][metric]))
+        
+    except Exception as e:
+        return jsonify({"error": f"ARIMA prediction failed: {str(e)}"}), 500
+
+@app.route('/predict/batch', methods=['POST'])
+def predict_batch():
+    """Predict several metrics and horizons in one request, forecasting each model once"""
+    try:
+        data = request.get_json() or {}
+        items = data.get('requests', []) if isinstance(data, dict) else None
+        if not isinstance(items, list) or not items:
+            return jsonify({"error": "requests must be a non-empty list of prediction requests"}), 400
+        if len(items) > PREDICT_BATCH_MAX_REQUESTS:
+            return jsonify({"error": f"At most {PREDICT_BATCH_MAX_REQUESTS} prediction requests per batch"}), 400
+        
+        snap = snapshot
+        arima_models = snap['models']
+        
+        # Validate every item first; an invalid item fails only its own entry
+        parsed = []
+        for item in items:
+            if not isinstance(item, dict):
+                parsed.append((None, None, None, "Each request must be an object"))
+                continue
+            metric = item.get('metric', 'team_a_kills')
+            try:
+                days_ahead, alpha = parse_prediction_args(item)
+            except ValueError as e:
+                parsed.append((metric, None, None, str(e)))
+                continue
+            if metric not in arima_models:
+                parsed.append((metric, None, None, f"ARIMA model not available for {metric}"))
+                continue
+            parsed.append((metric, days_ahead, alpha, None))
+        
+        # Forecast each model once at the largest horizon any valid item asks of it
+        horizons = {}
+        for metric, days_ahead, alpha, error in parsed:
+            if error is None:
+                horizons[metric] = max(horizons.get(metric, 0), days_ahead)
+        for metric, steps in horizons.items():
+            cached_forecast(metric, arima_models[metric], steps=steps)
+        
+        results = []
+        for metric, days_ahead, alpha, error in parsed:
+            if error is not None:
+                results.append({"metric": metric, "error": error})
+                continue
+            
+            forecast, current_value = current_forecast(snap, metric, days_ahead, alpha)
+            if not forecast:
+                results.append({"metric": metric, "error": "Forecast generation failed"})
+                continue
+            
+            prediction = build_prediction(metric, forecast, current_value, snap['model_info'][metric])
+            prediction["alpha"] = alpha
+            results.append(prediction)
         
         return jsonify({
-            "metric": metric,
-            "current_value": round(current_value, 2),
-            "predictions": predictions,
-            "model_info": {
-                "type": "ARIMA",
-                "order": str(arima_models[metric].model.order),
-                "aic": round(arima_models[metric].aic, 2)
-            }
+            "results": results,
+            "models_used": [metric for metric in horizons if metric in arima_models]
         })
         
     except Exception as e:
-        return jsonify({"error": f"ARIMA prediction failed: {str(e)}"}), 500
+        return jsonify({"error": f"ARIMA batch prediction failed: {str(e)}"}), 500
+
+@app.route('/simulation')
+def get_simulation():
+    """Monte Carlo win probabilities and expected wins for team A over the forecast horizon"""
+    try:
+        options = parse_simulation_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    try:
+        snap = snapshot
+        forecaster_a = online_engine.forecaster('team_a_efficiency')
+        forecaster_b = online_engine.forecaster('team_b_efficiency')
+        if forecaster_a is None or forecaster_b is None:
+            return jsonify({"error": "Efficiency models not available for simulation"}), 500
+        
+        elapsed = {}
+        
+        def build_simulation_payload():
+            start = time.perf_counter()
+            with timed('simulation'):
+                payload = simulate_wins(forecaster_a, forecaster_b, **options)
+            elapsed['ms'] = round((time.perf_counter() - start) * 1000, 1)
+            return payload
+        
+        key = f"simulation:{options['steps']}:{options['n_paths']}:{options['seed']}:{options['alpha']}"
+        response = cached_json_response(key, (snap['version'], online_engine.version), build_simulation_payload)
+        # Timing stays out of the cached body so cache hits don't replay the first run's cost
+        if 'ms' in elapsed:
+            response.headers['X-Simulation-Ms'] = str(elapsed['ms'])
+        return response
+        
+    except Exception as e:
+        return jsonify({"error": f"Simulation failed: {str(e)}"}), 500
+
+@app.route('/entities')
+def get_entities():
+    """List the teams or players available for entity-level queries"""
+    store = get_entity_store()
+    if store is None:
+        return jsonify({"error": "Entity data not available"}), 500
+    
+    entity_forecasts = get_entity_forecasts()
+    return jsonify({
+        "entities": store.entity_names.tolist(),
+        "total_entities": store.n_entities,
+        "metrics": store.metrics,
+        "total_observations": len(store),
+        "forecasts_available": len(entity_forecasts.rows) if entity_forecasts else 0
+    })
+
+@app.route('/observations/live', methods=['POST'])
+def add_live_observations():
+    """Apply provisional in-tournament values to the live Kalman state without touching the models
+    
+    The body is {"date": "YYYY-MM-DD", "values": {metric: value}}; the date is
+    each metric's next day, or its latest live day to revise that value.
+    """
+    refused = refuse_uncoordinated_write()
+    if refused:
+        return refused
+    
+    try:
+        start = time.perf_counter()
+        data = request.get_json() or {}
+        values = data.get('values')
+        if not data.get('date') or not isinstance(values, dict) or not values:
+            return jsonify({"error": "Provide a date and a values object of metric: value"}), 400
+        
+        try:
+            with timed('online_update'):
+                results = online_engine.update(data['date'], values)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        
+        return jsonify({
+            "date": pd.Timestamp(data['date']).strftime('%Y-%m-%d'),
+            "updates": results,
+            "update_ms": round((time.perf_counter() - start) * 1000, 3)
+        })
+        
+    except Exception as e:
+        return jsonify({"error": f"Live update failed: {str(e)}"}), 500
+
+@app.route('/observations', methods=['POST'])
+def add_observations():
+    """Append new match days and advance the ARIMA models without refitting"""
+    refused = refuse_uncoordinated_write()
+    if refused:
+        return refused
+    if snapshot['df'] is None:
+        return jsonify({"error": "Time series data not available"}), 500
+    
+    try:
+        start = time.perf_counter()
+        data = request.get_json() or {}
+        rows = data.get('observations', [])
+        if not rows:
+            return jsonify({"error": "No observations provided"}), 400
+        
+        new_rows = pd.DataFrame(rows)
+        if 'date' not in new_rows.columns:
+            return jsonify({"error": "Each observation needs a date"}), 400
+        new_rows['date'] = pd.to_datetime(new_rows['date'])
+        new_rows = new_rows.set_index('date').sort_index()
+        
+        # Derived metrics can be filled in from the team kill counts
+        if 'total_kills' not in new_rows.columns and {'team_a_kills', 'team_b_kills'} <= set(new_rows.columns):
+            new_rows['total_kills'] = (new_rows['team_a_kills'] + new_rows['team_b_kills']).round(1)
+        if 'kill_difference' not in new_rows.columns and {'team_a_kills', 'team_b_kills'} <= set(new_rows.columns):
+            new_rows['kill_difference'] = (new_rows['team_a_kills'] - new_rows['team_b_kills']).round(1)
+        
+        # Hold the write lock from validation to publish so concurrent appends cannot interleave
+        with _write_lock:
+            return append_observations(new_rows, start)
+        
+    except Exception as e:
+        return jsonify({"error": f"Observation ingestion failed: {str(e)}"}), 500
+
+def append_observations(new_rows, start):
+    """Validate new rows against the current snapshot and publish the extended one"""
+    global entity_store
+    
+    current = snapshot
+    df = current['df']
+    unknown = sorted(set(new_rows.columns) - set(df.columns))
+    missing = [column for column in df.columns if column not in new_rows.columns or new_rows[column].isna().any()]
+    if unknown or missing:
+        return jsonify({"error": "Observations must provide exactly the existing metrics", "unknown": unknown, "missing": missing}), 400
+    
+    # State-space models need a gapless daily index continuing from the last observation
+    expected_dates = pd.date_range(df.index[-1] + timedelta(days=1), periods=len(new_rows), freq='D')
+    if not new_rows.index.equals(expected_dates):
+        return jsonify({"error": f"Observations must be consecutive days starting {expected_dates[0].strftime('%Y-%m-%d')}"}), 400
+    
+    new_rows = new_rows[df.columns].astype(df.dtypes.to_dict())
+    
+    # Build the next snapshot beside the live one; requests keep reading the old one until it is published
+    with timed('arima_update'):
+        updated_models = {metric: model.extend(new_rows[metric]) for metric, model in current['models'].items()}
+    
+    df = pd.concat([df, new_rows])
+    df.index.name = 'date'
+    # Not re-shared: writes need a single worker, so there is nobody to share with, and
+    # copying the whole frame into a new segment would make every append O(rows)
+    dashboard = copy.deepcopy(current['dashboard'])
+    dashboard.append(df, len(new_rows))
+    rollups = copy.deepcopy(current['rollups'])
+    rollups.append(df, len(new_rows))
+    forecasts = dict(current['forecasts'])
+    for metric, model in updated_models.items():
+        forecast = cached_forecast(metric, model, steps=FORECAST_HORIZON)
+        if forecast:
+            forecasts[metric] = forecast
+    
+    publish_snapshot(df, updated_models, forecasts, current['model_info'], dashboard, rollups, current['fitted_at'])
+    invalidate_diagnostics(new_rows.columns)
+    if not table_available(ENTITY_TABLE):
+        # The derived per-team store is rebuilt from df on next use
+        entity_store = None
+    
+    # Keep the stored table in step so the next restart refits on the full history
+    append_rows(new_rows, TIMESERIES_TABLE)
+    refit_scheduler.notify_change()
+    
+    return jsonify({
+        "rows_added": len(new_rows),
+        "total_observations": len(df),
+        "last_date": df.index[-1].strftime('%Y-%m-%d'),
+        "models_updated": list(updated_models.keys()),
+        "snapshot_version": snapshot['version'],
+        "update_ms": round((time.perf_counter() - start) * 1000, 2)
+    })
 
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=int(os.environ.get('PORT', 5000))) 
\ No newline at end of file
@@ -0,0 +1,291 @@
+# AVP Beach Volleyball Analytics Platform - Benchmark Suite
+# Times the data, modelling and API stages at several data sizes and compares against a baseline
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from synthetic_data import generate_matches, generate_timeseries
+
+DEFAULT_SIZES = [365, 1460, 5840]  # Days of history (one, four and sixteen seasons)
+DEFAULT_REPEAT = 3
+DEFAULT_THRESHOLD = 0.25   # Relative slowdown reported as a regression
+NOISE_FLOOR_SECONDS = 0.002  # Differences below this are timer noise, never regressions
+STAGES = ['fit', 'forecast', 'visualization', 'clean', 'features', 'train', 'routes']
+
+BENCH_METRIC = 'team_a_kills'
+BENCH_ORDER = (2, 1, 2)
+ROUTE_REQUESTS = 20
+
+def peak_memory_mb(func):
+    """Peak traced memory of one run of func, in MB"""
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024 / 1024
+
+def measure(func, repeat=DEFAULT_REPEAT):
+    """Best and mean wall time over repeat runs, plus peak traced memory of one extra run"""
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+
+    # Memory is traced separately because tracing slows the code down
+    return {
+        'seconds': min(timings),
+        'mean_seconds': statistics.fmean(timings),
+        'peak_mb': peak_memory_mb(func)
+    }, result
+
+def quiet(func):
+    """Wrap a stage so its progress prints do not flood the benchmark output"""
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return func()
+    return run
+
+def bench_modelling(results, size, stages, repeat):
+    """fit_arima_model, generate_forecast and create_visualization on one metric"""
+    from forecasting import fit_arima_model, generate_forecast
+    from visualization import create_visualization
+
+    series = generate_timeseries(n_days=size)[BENCH_METRIC]
+    if 'fit' in stages or 'forecast' in stages or 'visualization' in stages:
+        stats, (model, error) = measure(quiet(lambda: fit_arima_model(series, BENCH_ORDER)), repeat)
+        if error:
+            print(f"⚠️  fit_arima_model failed at {size} days: {error}")
+            return
+        if 'fit' in stages:
+            results[f"fit_arima_model[{size}]"] = stats
+
+    if 'forecast' in stages or 'visualization' in stages:
+        stats, forecast = measure(lambda: generate_forecast(model, steps=30), repeat)
+        if 'forecast' in stages:
+            results[f"generate_forecast[{size}]"] = stats
+
+    if 'visualization' in stages:
+        stats, _ = measure(lambda: create_visualization(BENCH_METRIC, series, forecast), repeat)
+        results[f"create_visualization[{size}]"] = stats
+
+def bench_pipeline(results, size, stages, repeat):
+    """clean_data, add_features and train_model on size matches"""
+    from clean_data import add_features, clean_data
+    from train_model import prepare_features, train_model
+
+    matches = generate_matches(n_samples=size)
+    if 'clean' in stages:
+        results[f"clean_data[{size}]"], _ = measure(quiet(lambda: clean_data(matches.copy())), repeat)
+
+    cleaned = quiet(lambda: clean_data(matches.copy()))()
+    if 'features' in stages:
+        results[f"add_features[{size}]"], _ = measure(quiet(lambda: add_features(cleaned.copy())), repeat)
+
+    if 'train' in stages:
+        X, y, _ = prepare_features(cleaned)
+        results[f"train_model[{size}]"], _ = measure(quiet(lambda: train_model(X, y)), repeat)
+
+def route_requests():
+    """(name, method, path, json body) for every benchmarked endpoint"""
+    return [
+        ('GET /health', 'get', '/health', None),
+        ('GET /timeseries', 'get', '/timeseries', None),
+        ('GET /timeseries/rollup', 'get', '/timeseries/rollup?freq=M', None),
+        ('GET /forecast', 'get', '/forecast', None),
+        ('GET /dashboard', 'get', '/dashboard', None),
+        ('GET /visualization', 'get', f'/visualization/{BENCH_METRIC}', None),
+        ('GET /stationarity', 'get', f'/stationarity/{BENCH_METRIC}', None),
+        ('POST /predict', 'post', '/predict', {'metric': BENCH_METRIC, 'days_ahead': 14}),
+        ('POST /predict/batch', 'post', '/predict/batch', {'requests': [
+            {'metric': BENCH_METRIC, 'days_ahead': 7},
+            {'metric': 'total_kills', 'days_ahead': 30},
+            {'metric': 'team_b_efficiency', 'days_ahead': 60}
+        ]})
+    ]
+
+def bench_routes(results, size, api):
+    """Boot the API on size days of data and time each endpoint through the test client"""
+    from column_store import save_table
+
+    save_table(generate_timeseries(n_days=size), api.TIMESERIES_TABLE)
+    start = time.perf_counter()
+    quiet(api.initialize_arima_system)()
+    startup_seconds = time.perf_counter() - start
+    # The traced second start reuses the model cache written by the first, so its peak excludes fitting
+    results[f"api_startup[{size}]"] = {
+        'seconds': startup_seconds,
+        'mean_seconds': startup_seconds,
+        'peak_mb': peak_memory_mb(quiet(api.initialize_arima_system))
+    }
+
+    client = api.app.test_client()
+    for name, method, path, body in route_requests():
+        timings = []
+        size_bytes = 0
+        for _ in range(ROUTE_REQUESTS):
+            start = time.perf_counter()
+            response = getattr(client, method)(path, json=body)
+            timings.append(time.perf_counter() - start)
+            size_bytes = len(response.get_data())
+            if response.status_code != 200:
+                print(f"⚠️  {name} returned {response.status_code} at {size} days")
+                break
+
+        # The first request renders responses that later requests are served from cache
+        warm = timings[1:] or timings
+        results[f"{name}[{size}]"] = {
+            'seconds': statistics.median(warm),
+            'mean_seconds': statistics.fmean(warm),
+            'first_seconds': timings[0],
+            'p95_seconds': float(np.percentile(warm, 95)),
+            'response_bytes': size_bytes,
+            'peak_mb': peak_memory_mb(lambda: getattr(client, method)(path, json=body))
+        }
+
+def environment():
+    """Versions and hardware the numbers were recorded on"""
+    import sklearn
+    import statsmodels
+
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'statsmodels': statsmodels.__version__,
+        'scikit-learn': sklearn.__version__
+    }
+
+def run_benchmarks(sizes=DEFAULT_SIZES, stages=STAGES, repeat=DEFAULT_REPEAT):
+    """Run the selected stages at every size in a scratch data directory"""
+    results = {}
+    original_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as work_dir:
+        # Every module resolves data/ relative to the working directory
+        os.chdir(work_dir)
+        api = None
+        try:
+            # Convergence and frequency warnings from statsmodels would bury the report
+            warnings.simplefilter('ignore')
+            for size in sizes:
+                print(f"⏱️  Benchmarking {size} days...")
+                bench_modelling(results, size, stages, repeat)
+                bench_pipeline(results, size, stages, repeat)
+                if 'routes' in stages:
+                    if api is None:
+                        with contextlib.redirect_stdout(io.StringIO()):
+                            import api
+                    bench_routes(results, size, api)
+        finally:
+            if api is not None and 'SHARED_DIR' not in os.environ:
+                # The default segment directory is named after the scratch data directory
+                import shared_arrays
+                shutil.rmtree(shared_arrays.SHARED_DIR, ignore_errors=True)
+            os.chdir(original_dir)
+
+    return {'environment': environment(), 'sizes': list(sizes), 'repeat': repeat, 'results': results}
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """Rows of (name, baseline seconds, current seconds, ratio, status) for shared benchmarks"""
+    rows = []
+    for name, now in current['results'].items():
+        before = baseline['results'].get(name)
+        if before is None:
+            rows.append((name, None, now['seconds'], None, 'new'))
+            continue
+
+        ratio = now['seconds'] / before['seconds'] if before['seconds'] > 0 else float('inf')
+        delta = now['seconds'] - before['seconds']
+        if ratio > 1 + threshold and delta > NOISE_FLOOR_SECONDS:
+            status = 'regression'
+        elif ratio < 1 / (1 + threshold) and -delta > NOISE_FLOOR_SECONDS:
+            status = 'improvement'
+        else:
+            status = 'ok'
+        rows.append((name, before['seconds'], now['seconds'], ratio, status))
+
+    for name in baseline['results']:
+        if name not in current['results']:
+            rows.append((name, baseline['results'][name]['seconds'], None, None, 'missing'))
+    return rows
+
+def print_results(report):
+    print(f"\n📊 {'benchmark':<32} {'seconds':>10} {'peak MB':>9}")
+    for name, stats in report['results'].items():
+        peak = f"{stats['peak_mb']:.1f}" if 'peak_mb' in stats else '-'
+        print(f"   {name:<32} {stats['seconds']:>10.4f} {peak:>9}")
+
+def print_comparison(rows, threshold):
+    icons = {'regression': '❌', 'improvement': '🚀', 'ok': '✅', 'new': '🆕', 'missing': '⚠️ '}
+    print(f"\n📈 Comparison against baseline (threshold {threshold:.0%}):")
+    for name, before, now, ratio, status in rows:
+        before_text = f"{before:.4f}s" if before is not None else '-'
+        now_text = f"{now:.4f}s" if now is not None else '-'
+        ratio_text = f"{ratio:.2f}x" if ratio is not None else ''
+        print(f"  {icons[status]} {name:<32} {before_text:>10} -> {now_text:>10} {ratio_text:>7}")
+
+def main():
+    """Run the benchmark suite, save the results and optionally compare with a baseline"""
+    parser = argparse.ArgumentParser(description="Benchmark the analytics pipeline and API")
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)), help="comma-separated days of history (and matches)")
+    parser.add_argument('--stages', default=','.join(STAGES), help=f"comma-separated stages from {','.join(STAGES)}")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help="runs per stage; the best is recorded")
+    parser.add_argument('--output', default='benchmark_results.json', help="where to write the results")
+    parser.add_argument('--compare', metavar='BASELINE', help="baseline JSON to compare against")
+    parser.add_argument('--current', metavar='RESULTS', help="compare an existing results file instead of running")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help="relative slowdown flagged as a regression")
+    args = parser.parse_args()
+
+    stages = args.stages.split(',')
+    unknown = [stage for stage in stages if stage not in STAGES]
+    if unknown:
+        print(f"❌ Unknown stages {unknown}; choose from {STAGES}")
+        sys.exit(2)
+
+    if args.current:
+        with open(args.current) as f:
+            report = json.load(f)
+    else:
+        print("🏐 AVP Beach Volleyball Analytics - Benchmarks")
+        print("=" * 60)
+        report = run_benchmarks([int(size) for size in args.sizes.split(',')], stages, args.repeat)
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print_results(report)
+        print(f"\n💾 Results saved to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        rows = compare(baseline, report, args.threshold)
+        print_comparison(rows, args.threshold)
+
+        regressions = [row for row in rows if row[4] == 'regression']
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) beyond {args.threshold:.0%}")
+            sys.exit(1)
+        print("\n✅ No regressions")
+
+if __name__ == "__main__":
+    main()
@@ -2,63 +2,13 @@
 # Professional sports analytics data cleaning and preparation
 
 import pandas as pd
-import numpy as np
-import os
-from datetime import datetime
+from column_store import load_table, save_table, table_path, table_size
+from synthetic_data import generate_matches
 
-def create_sample_data():
+def create_sample_data(n_samples=300):
     """Create comprehensive sample volleyball data for demonstration"""
     print("📊 Creating sample volleyball data...")
-    
-    np.random.seed(42)
-    n_samples = 300
-    
-    # Generate realistic volleyball match data
-    data = {
-        'match_date': pd.date_range('2022-01-01', periods=n_samples),
-        'team_a_total_kills': np.random.randint(10, 35, n_samples),
-        'team_a_total_digs': np.random.randint(15, 40, n_samples),
-        'team_a_total_errors': np.random.randint(2, 15, n_samples),
-        'team_a_total_aces': np.random.randint(0, 8, n_samples),
-        'team_b_total_kills': np.random.randint(10, 35, n_samples),
-        'team_b_total_digs': np.random.randint(15, 40, n_samples),
-        'team_b_total_errors': np.random.randint(2, 15, n_samples),
-        'team_b_total_aces': np.random.randint(0, 8, n_samples),
-        'team_a_kill_efficiency': np.random.uniform(0.4, 0.95, n_samples),
-        'team_b_kill_efficiency': np.random.uniform(0.4, 0.95, n_samples)
-    }
-    
-    df = pd.DataFrame(data)
-    
-    # Create performance-based scoring system
-    df['team_a_score'] = (
-        df['team_a_total_kills'] * 0.4 + 
-        df['team_a_total_aces'] * 0.3 + 
-        df['team_a_kill_efficiency'] * 25 - 
-        df['team_a_total_errors'] * 0.2
-    )
-    
-    df['team_b_score'] = (
-        df['team_b_total_kills'] * 0.4 + 
-        df['team_b_total_aces'] * 0.3 + 
-        df['team_b_kill_efficiency'] * 25 - 
-        df['team_b_total_errors'] * 0.2
-    )
-    
-    # Add realistic variability
-    df['team_a_score'] += np.random.normal(0, 3, n_samples)
-    df['team_b_score'] += np.random.normal(0, 3, n_samples)
-    
-    # Determine winners
-    df['winner'] = np.where(df['team_a_score'] > df['team_b_score'], 'Team A', 'Team B')
-    df['winner_binary'] = np.where(df['winner'] == 'Team A', 1, 0)
-    
-    # Add additional derived features
-    df['total_kills'] = df['team_a_total_kills'] + df['team_b_total_kills']
-    df['kill_difference'] = df['team_a_total_kills'] - df['team_b_total_kills']
-    df['efficiency_difference'] = df['team_a_kill_efficiency'] - df['team_b_kill_efficiency']
-    
-    return df
+    return generate_matches(n_samples=n_samples)
 
 def clean_data(df):
     """Clean and validate the volleyball data"""
@@ -161,18 +111,14 @@ def validate_data(df):
     
     return True
 
-def save_data(df, filename='volleyball_data.csv'):
+def save_data(df, name='volleyball_data'):
     """Save the processed data"""
-    print(f"💾 Saving data to {filename}...")
-    
-    # Create data directory if it doesn't exist
-    os.makedirs('data', exist_ok=True)
+    print(f"💾 Saving data to {name}...")
     
-    filepath = os.path.join('data', filename)
-    df.to_csv(filepath, index=False)
+    save_table(df, name)
     
-    print(f"✅ Data saved successfully to {filepath}")
-    print(f"📊 File size: {os.path.getsize(filepath) / 1024:.1f} KB")
+    print(f"✅ Data saved successfully to {table_path(name)}")
+    print(f"📊 Size on disk: {table_size(table_path(name)) / 1024:.1f} KB")
 
 def main():
     """Main data processing function"""
@@ -181,11 +127,9 @@ def main():
     print("=" * 60)
     
     # Create or load data
-    data_path = os.path.join('data', 'volleyball_data.csv')
-    if os.path.exists(data_path):
+    df = load_table('volleyball_data')
+    if df is not None:
         print("📊 Loading existing data...")
-        df = pd.read_csv(data_path)
-        df['match_date'] = pd.to_datetime(df['match_date'])
     else:
         print("📊 Creating new sample data...")
         df = create_sample_data()
@@ -0,0 +1,249 @@
+# AVP Beach Volleyball Analytics Platform - Columnar Storage
+# Binary column files that are memory-mapped on load, migrated once from the legacy CSVs
+
+import json
+import os
+import shutil
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+DATA_DIR = 'data'
+TABLE_SUFFIX = '.cols'
+FORMAT_VERSION = 1
+
+# CSV parsing options for the tables that existed before columnar storage
+TABLES = {
+    'volleyball_timeseries': {'index_col': 'date', 'parse_dates': True},
+    'volleyball_data': {'parse_dates': ['match_date']},
+    'entity_timeseries': {'parse_dates': ['date']}
+}
+
+def table_path(name):
+    return os.path.join(DATA_DIR, f"{name}{TABLE_SUFFIX}")
+
+def csv_path(name):
+    return os.path.join(DATA_DIR, f"{name}.csv")
+
+def table_available(name):
+    """True when a table exists in columnar form or can be migrated from CSV"""
+    return os.path.exists(table_path(name)) or os.path.exists(csv_path(name))
+
+def _read_meta(path):
+    with open(os.path.join(path, 'meta.json')) as f:
+        return json.load(f)
+
+def _write_meta(path, meta):
+    """Replace meta.json atomically; it is the commit point for writes and appends"""
+    tmp_path = os.path.join(path, f"meta.json.{os.getpid()}.tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp_path, os.path.join(path, 'meta.json'))
+
+def _is_text(series):
+    return pd.api.types.is_string_dtype(series.dtype) or isinstance(series.dtype, pd.CategoricalDtype)
+
+def _encode_text(series, categories=None):
+    """Dictionary-encode a text column as int32 codes, extending categories as needed"""
+    categories = list(categories or [])
+    index = pd.Index(categories, dtype=object)
+    values = series.astype(object).to_numpy()
+    codes = index.get_indexer(values)
+
+    new = pd.unique(values[codes == -1])
+    if len(new):
+        categories.extend(str(value) for value in new)
+        codes = pd.Index(categories, dtype=object).get_indexer(values)
+    return codes.astype(np.int32), categories
+
+def write_table(df, path):
+    """Write every column (and a named index) of df as one binary file per column"""
+    frame = df.reset_index() if df.index.name is not None else df
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+
+    columns = []
+    for name in frame.columns:
+        column = {'name': str(name)}
+        if _is_text(frame[name]):
+            array, column['categories'] = _encode_text(frame[name])
+        else:
+            array = np.ascontiguousarray(frame[name].to_numpy())
+        array.tofile(os.path.join(tmp_path, f"{name}.bin"))
+        column['dtype'] = array.dtype.str
+        columns.append(column)
+
+    _write_meta(tmp_path, {
+        'format': FORMAT_VERSION,
+        'rows': len(frame),
+        'index': df.index.name,
+        'columns': columns
+    })
+
+    # Swap the finished directory into place so readers never see a partial table
+    old_path = f"{path}.{os.getpid()}.old"
+    if os.path.exists(path):
+        os.replace(path, old_path)
+    os.replace(tmp_path, path)
+    shutil.rmtree(old_path, ignore_errors=True)
+
+def read_columns(path, columns=None):
+    """Memory-map the requested columns without copying them
+
+    Text columns are returned as their int32 codes; meta['columns'] holds the categories.
+    """
+    meta = _read_meta(path)
+    dtypes = {column['name']: np.dtype(column['dtype']) for column in meta['columns']}
+    names = columns or list(dtypes)
+    missing = [name for name in names if name not in dtypes]
+    if missing:
+        raise KeyError(f"Columns {missing} not in table {path}")
+
+    arrays = {}
+    for name in names:
+        if meta['rows'] == 0:
+            arrays[name] = np.empty(0, dtype=dtypes[name])
+        else:
+            arrays[name] = np.memmap(os.path.join(path, f"{name}.bin"), dtype=dtypes[name], mode='r', shape=(meta['rows'],))
+    return arrays, meta
+
+def read_table(path, columns=None):
+    """Load a table as a DataFrame, reading only the requested columns
+
+    Columns of one dtype are read straight into a shared 2-D block, so the
+    file bytes are copied exactly once and pandas does not consolidate again.
+    """
+    meta = _read_meta(path)
+    index = meta['index']
+    by_name = {column['name']: column for column in meta['columns']}
+    names = list(columns) if columns is not None else list(by_name)
+    if index and index not in names:
+        names.append(index)
+    missing = [name for name in names if name not in by_name]
+    if missing:
+        raise KeyError(f"Columns {missing} not in table {path}")
+
+    rows = meta['rows']
+    groups = {}
+    for name in names:
+        groups.setdefault(by_name[name]['dtype'], []).append(name)
+
+    pieces = []
+    for dtype, group in groups.items():
+        block = np.empty((len(group), rows), dtype=np.dtype(dtype))
+        for i, name in enumerate(group):
+            with open(os.path.join(path, f"{name}.bin"), 'rb') as f:
+                f.readinto(block[i].view(np.uint8))
+        piece = pd.DataFrame(block.T, columns=group, copy=False)
+        for name in group:
+            # Text comes back as pandas categoricals, which skips building a Python string per row
+            if 'categories' in by_name[name]:
+                piece[name] = pd.Categorical.from_codes(piece[name].to_numpy(), by_name[name]['categories'])
+        pieces.append(piece)
+
+    frame = pd.concat(pieces, axis=1)[names] if len(pieces) > 1 else pieces[0][names]
+    if index:
+        frame = frame.set_index(index)
+    return frame
+
+def append_table(df, path):
+    """Append rows with the same columns to an existing table"""
+    meta = _read_meta(path)
+    frame = df.reset_index() if meta['index'] else df
+    names = [column['name'] for column in meta['columns']]
+    if sorted(map(str, frame.columns)) != sorted(names):
+        raise ValueError(f"Columns {list(frame.columns)} do not match table columns {names}")
+
+    rows = meta['rows']
+    for column in meta['columns']:
+        file_path = os.path.join(path, f"{column['name']}.bin")
+        dtype = np.dtype(column['dtype'])
+        if 'categories' in column:
+            array, column['categories'] = _encode_text(frame[column['name']], column['categories'])
+        else:
+            array = frame[column['name']].to_numpy().astype(dtype)
+
+        with open(file_path, 'r+b') as f:
+            # Drop bytes from any append that failed before meta.json was updated
+            f.truncate(rows * dtype.itemsize)
+            f.seek(0, os.SEEK_END)
+            f.write(array.tobytes())
+
+    meta['rows'] = rows + len(frame)
+    _write_meta(path, meta)
+
+def table_size(path):
+    """Bytes on disk used by a table"""
+    return sum(entry.stat().st_size for entry in os.scandir(path))
+
+def migrate_table(name):
+    """Convert data/<name>.csv to columnar form, leaving the CSV in place"""
+    start = time.perf_counter()
+    df = pd.read_csv(csv_path(name), **TABLES.get(name, {}))
+    write_table(df, table_path(name))
+    print(f"🔄 Migrated {csv_path(name)} to {table_path(name)} in {time.perf_counter() - start:.2f}s")
+    return df
+
+def table_columns(name):
+    """Column names of a table without reading its data; None if it does not exist"""
+    if os.path.exists(table_path(name)):
+        return [column['name'] for column in _read_meta(table_path(name))['columns']]
+    if os.path.exists(csv_path(name)):
+        return list(pd.read_csv(csv_path(name), nrows=0).columns)
+    return None
+
+def load_table(name, columns=None):
+    """Load a table by name, migrating it from CSV on first use; None if it does not exist"""
+    if os.path.exists(table_path(name)):
+        return read_table(table_path(name), columns)
+    if os.path.exists(csv_path(name)):
+        df = migrate_table(name)
+        return df[columns] if columns is not None else df
+    return None
+
+def save_table(df, name):
+    """Write a table by name, replacing any previous version"""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    write_table(df, table_path(name))
+
+def append_rows(df, name):
+    """Append rows to a table by name, creating it if needed"""
+    if os.path.exists(table_path(name)):
+        append_table(df, table_path(name))
+    else:
+        save_table(df, name)
+
+def main():
+    """Migrate every known CSV table and compare load times"""
+    print("🏐 AVP Beach Volleyball Analytics - Columnar Storage")
+    print("=" * 60)
+
+    found = False
+    for name in TABLES:
+        if not table_available(name):
+            continue
+        found = True
+        if not os.path.exists(table_path(name)):
+            migrate_table(name)
+
+        start = time.perf_counter()
+        df = read_table(table_path(name))
+        columnar_seconds = time.perf_counter() - start
+        line = f"📊 {name}: {len(df):,} rows, {table_size(table_path(name)) / 1024 / 1024:.1f} MB, loads in {columnar_seconds * 1000:.1f}ms"
+
+        if os.path.exists(csv_path(name)):
+            start = time.perf_counter()
+            pd.read_csv(csv_path(name), **TABLES[name])
+            csv_seconds = time.perf_counter() - start
+            line += f" (CSV {csv_seconds * 1000:.1f}ms, {csv_seconds / max(columnar_seconds, 1e-9):.0f}x)"
+        print(line)
+
+    if not found:
+        print(f"❌ No tables found in {DATA_DIR}/")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# AVP Beach Volleyball Analytics Platform - Dashboard Aggregates
+# Materialized rolling-window statistics maintained incrementally as rows are appended
+
+import os
+import numpy as np
+
+def parse_windows(value, default=(7, 30, 90)):
+    """Positive window lengths from a comma-separated list, always including 30; default when none are valid"""
+    parts = [part.strip() for part in value.split(',') if part.strip()]
+    windows = {int(part) for part in parts if part.isdigit() and int(part) > 0}
+    result = sorted((windows or set(default)) | {30})
+    if len(windows) < len(parts) or not windows:
+        print(f"⚠️  DASHBOARD_WINDOWS={value!r} has invalid or no windows; using {result}")
+    return result
+
+DASHBOARD_WINDOWS = parse_windows(os.environ.get('DASHBOARD_WINDOWS', '7,30,90'))
+
+class DashboardView:
+    """Rolling sums for every metric column over several trailing windows
+
+    For a window holding y_0..y_{n-1} the view keeps S0 = sum(y_i) and
+    S1 = sum(i * y_i), which give the mean and the least-squares slope in
+    closed form. Appending a row updates both sums in O(columns) per window.
+    """
+
+    def __init__(self, df, windows=None):
+        self.windows = sorted(set(windows or DASHBOARD_WINDOWS))
+        self.rebuild(df)
+
+    def rebuild(self, df):
+        """Recompute every aggregate from scratch in one vectorized pass per window"""
+        self.columns = list(df.columns)
+        self.count = len(df)
+        tail = df.iloc[-max(self.windows):].to_numpy(dtype=float)
+        self.last = tail[-1].copy() if len(tail) else np.zeros(len(self.columns))
+        self.totals = df.to_numpy(dtype=float).sum(axis=0)
+
+        self.sums = {}
+        for window in self.windows:
+            values = tail[-window:]
+            self.sums[window] = {
+                'n': len(values),
+                's0': values.sum(axis=0),
+                's1': np.arange(len(values)) @ values
+            }
+
+    def append(self, df, n_new):
+        """Fold the last n_new rows of df (already appended) into the aggregates"""
+        if list(df.columns) != self.columns or len(df) != self.count + n_new:
+            self.rebuild(df)
+            return
+
+        # Only rows that are entering or leaving some window are touched
+        start = max(self.count - max(self.windows), 0)
+        recent = df.iloc[start:].to_numpy(dtype=float)
+        offset = self.count - start
+
+        for j in range(n_new):
+            row = recent[offset + j]
+            for window, sums in self.sums.items():
+                if sums['n'] < window:
+                    sums['s1'] += sums['n'] * row
+                    sums['s0'] += row
+                    sums['n'] += 1
+                else:
+                    # Sliding drops the oldest row and shifts every position down by one
+                    dropped = recent[offset + j - window]
+                    sums['s0'] -= dropped
+                    sums['s1'] += -(sums['s0']) + (window - 1) * row
+                    sums['s0'] += row
+            self.totals += row
+            self.last = row.copy()
+
+        self.count += n_new
+
+    def window_stats(self, window):
+        """Slope, mean and current value of every column over a window"""
+        sums = self.sums[window]
+        n = sums['n']
+        mean = sums['s0'] / n if n else np.zeros(len(self.columns))
+        if n >= 2:
+            x_mean = (n - 1) / 2
+            sxx = n * (n * n - 1) / 12
+            slope = (sums['s1'] - x_mean * sums['s0']) / sxx
+        else:
+            slope = np.zeros(len(self.columns))
+
+        return {
+            column: {'slope': float(slope[i]), 'mean': float(mean[i]), 'current': float(self.last[i])}
+            for i, column in enumerate(self.columns)
+        }
+
+    def window_sum(self, window, column):
+        """Sum of a column over a window, with the number of rows it covers"""
+        sums = self.sums[window]
+        return float(sums['s0'][self.columns.index(column)]), sums['n']
+
+    def total(self, column):
+        """Sum of a column over all rows"""
+        return float(self.totals[self.columns.index(column)])
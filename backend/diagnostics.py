@@ -0,0 +1,76 @@
+# AVP Beach Volleyball Analytics Platform - Stationarity Diagnostics
+# ADF and KPSS results computed once per metric and reused until the metric changes
+
+import os
+import time
+import warnings
+
+from fit_pool import run_tasks
+from forecasting import check_stationarity
+from lazy_imports import lazy_import
+
+stattools = lazy_import('statsmodels.tsa.stattools')
+
+PRECOMPUTE_DIAGNOSTICS = os.environ.get('PRECOMPUTE_DIAGNOSTICS', '0') == '1'
+
+# Diagnostics per metric, tagged with the length and last date of the series they describe
+_diagnostics = {}
+
+def check_kpss(timeseries):
+    """Check trend-stationarity using the KPSS test (null hypothesis: stationary)"""
+    with warnings.catch_warnings():
+        # KPSS warns when the statistic falls outside its p-value table
+        warnings.simplefilter('ignore')
+        result = stattools.kpss(timeseries.dropna(), regression='c', nlags='auto')
+    return {
+        'kpss_statistic': float(result[0]),
+        'p_value': float(result[1]),
+        'lags': int(result[2]),
+        'critical_values': result[3],
+        'is_stationary': bool(result[1] >= 0.05)
+    }
+
+def compute_diagnostics(timeseries):
+    """Run ADF and KPSS on a series, timing the work for the fit pool"""
+    start = time.perf_counter()
+    adf = check_stationarity(timeseries)
+    adf['is_stationary'] = bool(adf['is_stationary'])
+
+    return {
+        'adf': adf,
+        'kpss': check_kpss(timeseries),
+        'seconds': time.perf_counter() - start
+    }
+
+def _series_tag(timeseries):
+    """Cheap identity of a series: its length and last date"""
+    return (len(timeseries), timeseries.index[-1] if len(timeseries) else None)
+
+def get_diagnostics(metric, timeseries):
+    """Return cached diagnostics for a metric, computing them on first use"""
+    entry = _diagnostics.get(metric)
+    if entry is None or entry['tag'] != _series_tag(timeseries):
+        entry = {'tag': _series_tag(timeseries), 'result': compute_diagnostics(timeseries)}
+        _diagnostics[metric] = entry
+    return entry['result']
+
+def precompute_diagnostics(series_by_metric, workers=None):
+    """Compute diagnostics for every stale metric in parallel"""
+    stale = {
+        metric: timeseries for metric, timeseries in series_by_metric.items()
+        if metric not in _diagnostics or _diagnostics[metric]['tag'] != _series_tag(timeseries)
+    }
+    results, stats = run_tasks(compute_diagnostics, [(metric, (timeseries,)) for metric, timeseries in stale.items()], workers=workers)
+
+    for metric, result in results.items():
+        if not result.get('error'):
+            _diagnostics[metric] = {'tag': _series_tag(stale[metric]), 'result': result}
+    return results, stats
+
+def invalidate_diagnostics(metrics=None):
+    """Forget diagnostics for the given metrics, or for all metrics"""
+    if metrics is None:
+        _diagnostics.clear()
+        return
+    for metric in metrics:
+        _diagnostics.pop(metric, None)
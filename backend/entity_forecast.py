@@ -0,0 +1,218 @@
+# AVP Beach Volleyball Analytics Platform - Batched Entity Forecasting
+# Fits one ARIMA model per entity and metric in parallel with bounded memory
+
+import argparse
+import os
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from column_store import load_table
+from entity_store import load_entity_store
+from fit_pool import resolve_workers, run_tasks
+from forecasting import MAX_FORECAST_HORIZON, slice_forecast
+from lazy_imports import lazy_import
+
+arima_model = lazy_import('statsmodels.tsa.arima.model')
+
+ENTITY_FORECAST_PATH = os.path.join('data', 'entity_forecasts.npz')
+ENTITY_ORDER = (1, 1, 1)
+BATCH_SIZE = 32     # Series fitted per pool task, to amortize inter-process overhead
+CHUNK_SERIES = 4096  # Series in flight at once; bounds the memory held by pending results
+
+def fit_series_batch(keys, arrays, order, steps):
+    """Fit and forecast a batch of series, returning compact arrays only
+
+    Series are treated as one observation per day, like the team-level data.
+    """
+    start = time.perf_counter()
+    results = []
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        for key, values in zip(keys, arrays):
+            values = values[~np.isnan(values)]
+            if len(values) < 10:
+                results.append({'key': key, 'error': "Insufficient data for ARIMA modeling"})
+                continue
+            try:
+                fitted = arima_model.ARIMA(values, order=order).fit()
+                prediction = fitted.get_forecast(steps=steps)
+                results.append({
+                    'key': key,
+                    'mean': np.asarray(prediction.predicted_mean, dtype=float),
+                    'variance': np.asarray(prediction.var_pred_mean, dtype=float),
+                    'aic': float(fitted.aic),
+                    'current': float(values[-1])
+                })
+            except Exception as e:
+                results.append({'key': key, 'error': str(e)})
+
+    return {'series': results, 'seconds': time.perf_counter() - start}
+
+def forecast_entities(store, metrics=None, order=ENTITY_ORDER, steps=MAX_FORECAST_HORIZON,
+                      workers=None, batch_size=BATCH_SIZE, chunk_series=CHUNK_SERIES):
+    """Fit every entity/metric series of a store in parallel chunks
+
+    Returns (forecasts, stats): forecasts holds one row per successfully fitted
+    series in preallocated arrays; stats reports failures and throughput.
+    """
+    metrics = metrics or store.metrics
+    n_series = store.n_entities * len(metrics)
+
+    keys = []
+    last_dates = []
+    mean = np.empty((n_series, steps))
+    variance = np.empty((n_series, steps))
+    aic = np.empty(n_series)
+    current = np.empty(n_series)
+    failures = {}
+
+    start = time.perf_counter()
+    serial_seconds = 0.0
+    series_iter = store.iter_series(metrics)
+    exhausted = False
+
+    while not exhausted:
+        # Pull at most one chunk of series so pending inputs and results stay bounded
+        chunk = []
+        for _ in range(chunk_series):
+            item = next(series_iter, None)
+            if item is None:
+                exhausted = True
+                break
+            chunk.append(item)
+        if not chunk:
+            break
+
+        last_date_by_key = {(entity, metric): last_date for entity, metric, _, last_date in chunk}
+        tasks = []
+        for position in range(0, len(chunk), batch_size):
+            batch = chunk[position:position + batch_size]
+            tasks.append((position, ([(entity, metric) for entity, metric, _, _ in batch], [np.array(values) for _, _, values, _ in batch], order, steps)))
+
+        results, _ = run_tasks(fit_series_batch, tasks, workers=workers)
+        for position, result in results.items():
+            if result.get('error'):
+                for entity, metric, _, _ in chunk[position:position + batch_size]:
+                    failures[(entity, metric)] = result['error']
+                continue
+
+            serial_seconds += result['seconds']
+            for series in result['series']:
+                if 'error' in series:
+                    failures[series['key']] = series['error']
+                    continue
+                row = len(keys)
+                keys.append(series['key'])
+                last_dates.append(last_date_by_key[series['key']])
+                mean[row] = series['mean']
+                variance[row] = series['variance']
+                aic[row] = series['aic']
+                current[row] = series['current']
+
+    wall_seconds = time.perf_counter() - start
+    n_fitted = len(keys)
+    forecasts = {
+        'entities': np.array([entity for entity, _ in keys], dtype=str),
+        'metrics': np.array([metric for _, metric in keys], dtype=str),
+        'last_dates': np.array(last_dates, dtype='datetime64[ns]'),
+        'mean': mean[:n_fitted],
+        'variance': variance[:n_fitted],
+        'aic': aic[:n_fitted],
+        'current': current[:n_fitted],
+        'order': np.array(order)
+    }
+    stats = {
+        'series': n_series,
+        'fitted': n_fitted,
+        'failed': len(failures),
+        'failures': failures,
+        'workers': resolve_workers(max(n_series // batch_size, 1), workers),
+        'wall_seconds': wall_seconds,
+        'serial_seconds': serial_seconds,
+        'series_per_second': n_series / wall_seconds if wall_seconds > 0 else 0.0
+    }
+    return forecasts, stats
+
+def save_entity_forecasts(forecasts, path=ENTITY_FORECAST_PATH):
+    """Write entity forecasts atomically so the API never reads a partial file"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, **forecasts)
+    os.replace(tmp_path, path)
+
+class EntityForecasts:
+    """Read-only lookup over the saved entity forecast arrays"""
+
+    def __init__(self, path=ENTITY_FORECAST_PATH):
+        with np.load(path, allow_pickle=False) as saved:
+            self.arrays = {name: saved[name] for name in saved.files}
+        self.order = tuple(int(x) for x in self.arrays['order'])
+        self.rows = {}
+        self.metrics_by_entity = {}
+        for row, (entity, metric) in enumerate(zip(self.arrays['entities'].tolist(), self.arrays['metrics'].tolist())):
+            self.rows[(entity, metric)] = row
+            self.metrics_by_entity.setdefault(entity, []).append(metric)
+
+    def metrics_for(self, entity):
+        return self.metrics_by_entity.get(entity, [])
+
+    def get(self, entity, metric, steps=30, alpha=0.05):
+        """Forecast slice for one entity and metric, or None when it was not fitted"""
+        row = self.rows.get((entity, metric))
+        if row is None or steps > self.arrays['mean'].shape[1]:
+            return None
+
+        last_date = pd.Timestamp(self.arrays['last_dates'][row])
+        arrays = {
+            'mean': self.arrays['mean'][row],
+            'variance': self.arrays['variance'][row],
+            'dates': pd.date_range(last_date + pd.Timedelta(days=1), periods=steps, freq='D').strftime('%Y-%m-%d').tolist()
+        }
+        return slice_forecast(arrays, steps, alpha)
+
+    def info(self, entity, metric):
+        row = self.rows[(entity, metric)]
+        return {'order': self.order, 'aic': float(self.arrays['aic'][row]), 'current': float(self.arrays['current'][row])}
+
+def main():
+    """Fit forecasts for every entity in the entity store and report throughput"""
+    parser = argparse.ArgumentParser(description="Batch-fit per-entity ARIMA forecasts")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: ARIMA_FIT_WORKERS)")
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help="series per pool task")
+    parser.add_argument('--chunk', type=int, default=CHUNK_SERIES, help="series in flight at once")
+    parser.add_argument('--order', default=','.join(map(str, ENTITY_ORDER)), help="ARIMA order as p,d,q")
+    parser.add_argument('--steps', type=int, default=MAX_FORECAST_HORIZON, help="forecast horizon")
+    parser.add_argument('--metrics', default=None, help="comma-separated metrics (default: all)")
+    args = parser.parse_args()
+
+    # Fall back to the team-level series the API builds when there is no entity file
+    store = load_entity_store(fallback_df=load_table('volleyball_timeseries'))
+    if store is None:
+        print("❌ No entity data found; create data/entity_timeseries.csv or start the API once")
+        return
+
+    print(f"🏐 Fitting {store.n_entities} entities x {len(store.metrics)} metrics from {len(store)} rows...")
+    forecasts, stats = forecast_entities(
+        store,
+        metrics=args.metrics.split(',') if args.metrics else None,
+        order=tuple(int(x) for x in args.order.split(',')),
+        steps=args.steps,
+        workers=args.workers,
+        batch_size=args.batch_size,
+        chunk_series=args.chunk
+    )
+    save_entity_forecasts(forecasts)
+
+    print(f"✅ Fitted {stats['fitted']}/{stats['series']} series on {stats['workers']} worker(s)")
+    for (entity, metric), error in list(stats['failures'].items())[:10]:
+        print(f"  ⚠️  {entity}/{metric}: {error}")
+    print(f"⏱️  {stats['wall_seconds']:.2f}s wall, {stats['serial_seconds']:.2f}s of fitting, "
+          f"{stats['series_per_second']:.1f} series/s")
+    print(f"💾 Saved to {ENTITY_FORECAST_PATH}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# AVP Beach Volleyball Analytics Platform - Entity Store
+# Long-format columnar storage of per-team (or per-player) time series
+
+import numpy as np
+import pandas as pd
+
+from column_store import load_table
+
+# Columnar table with entity, date and metric columns; migrated once from data/entity_timeseries.csv
+ENTITY_TABLE = 'entity_timeseries'
+
+# Per-team metrics and the wide team-level columns they come from
+TEAM_METRICS = ['kills', 'efficiency', 'wins']
+
+class EntityStore:
+    """Entity x date x metric table held as sorted columnar arrays
+
+    Rows are sorted by entity and then date, so every entity occupies one
+    contiguous block described by offsets[code]:offsets[code + 1]. Slicing an
+    entity's series is therefore a view into the value matrix, not a copy.
+    """
+
+    def __init__(self, entity_names, codes, dates, values, metrics):
+        order = np.lexsort((dates, codes))
+        self.entity_names = np.asarray(entity_names, dtype=object)
+        self.codes = np.ascontiguousarray(np.asarray(codes, dtype=np.int32)[order])
+        self.dates = np.ascontiguousarray(np.asarray(dates, dtype='datetime64[ns]')[order])
+        self.values = np.ascontiguousarray(np.asarray(values, dtype=float)[order])
+        self.metrics = list(metrics)
+        self.offsets = np.searchsorted(self.codes, np.arange(len(self.entity_names) + 1))
+        self._codes_by_name = {name: code for code, name in enumerate(self.entity_names)}
+
+    @classmethod
+    def from_long_frame(cls, frame):
+        """Build a store from a frame with entity, date and one column per metric"""
+        entities = pd.Categorical(frame['entity']) if isinstance(frame['entity'].dtype, pd.CategoricalDtype) else pd.Categorical(frame['entity'].astype(str))
+        metrics = [column for column in frame.columns if column not in ('entity', 'date')]
+        return cls(
+            entities.categories.to_numpy(dtype=object),
+            entities.codes,
+            pd.to_datetime(frame['date']).to_numpy(),
+            frame[metrics].to_numpy(dtype=float),
+            metrics
+        )
+
+    @classmethod
+    def from_team_frame(cls, df):
+        """Reshape the wide two-team time series into per-team rows"""
+        n = len(df)
+        dates = np.tile(df.index.to_numpy(), 2)
+        codes = np.repeat(np.arange(2, dtype=np.int32), n)
+        wins = df['team_a_wins'].to_numpy(dtype=float) if 'team_a_wins' in df.columns else np.full(n, np.nan)
+        values = np.column_stack([
+            np.concatenate([df['team_a_kills'].to_numpy(dtype=float), df['team_b_kills'].to_numpy(dtype=float)]),
+            np.concatenate([df['team_a_efficiency'].to_numpy(dtype=float), df['team_b_efficiency'].to_numpy(dtype=float)]),
+            np.concatenate([wins, 1 - wins])
+        ])
+        return cls(np.array(['team_a', 'team_b'], dtype=object), codes, dates, values, TEAM_METRICS)
+
+    def to_long_frame(self):
+        """Return the store as a long-format DataFrame"""
+        frame = pd.DataFrame(self.values, columns=self.metrics)
+        frame.insert(0, 'date', self.dates)
+        frame.insert(0, 'entity', self.entity_names[self.codes])
+        return frame
+
+    def __len__(self):
+        return len(self.codes)
+
+    @property
+    def n_entities(self):
+        return len(self.entity_names)
+
+    def has_entity(self, entity):
+        return entity in self._codes_by_name
+
+    def entity_rows(self, entity):
+        """Slice of the rows belonging to an entity"""
+        code = self._codes_by_name[entity]
+        return slice(self.offsets[code], self.offsets[code + 1])
+
+    def frame(self, entity):
+        """Date-indexed DataFrame of one entity's metrics"""
+        rows = self.entity_rows(entity)
+        return pd.DataFrame(self.values[rows], index=pd.DatetimeIndex(self.dates[rows], name='date'), columns=self.metrics)
+
+    def series(self, entity, metric):
+        """Date-indexed Series of one entity's metric"""
+        rows = self.entity_rows(entity)
+        return pd.Series(self.values[rows, self.metrics.index(metric)], index=pd.DatetimeIndex(self.dates[rows], name='date'), name=metric)
+
+    def iter_series(self, metrics=None):
+        """Yield (entity, metric, values, last_date) for every series without copying values"""
+        metrics = metrics or self.metrics
+        columns = [self.metrics.index(metric) for metric in metrics]
+        for code, name in enumerate(self.entity_names):
+            start, end = self.offsets[code], self.offsets[code + 1]
+            if start == end:
+                continue
+            for metric, column in zip(metrics, columns):
+                yield name, metric, self.values[start:end, column], self.dates[end - 1]
+
+def load_entity_store(name=ENTITY_TABLE, fallback_df=None):
+    """Load the entity store, deriving it from the team-level frame when no table exists"""
+    frame = load_table(name)
+    if frame is not None:
+        return EntityStore.from_long_frame(frame)
+    if fallback_df is not None:
+        return EntityStore.from_team_frame(fallback_df)
+    return None
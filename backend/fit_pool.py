@@ -0,0 +1,126 @@
+# AVP Beach Volleyball Analytics Platform - Parallel Model Fitting
+# Runs independent fitting tasks on a process pool with per-task timeouts
+
+import multiprocessing
+import os
+import threading
+import time
+
+FIT_WORKERS = int(os.environ.get('ARIMA_FIT_WORKERS', 0))  # 0 means one worker per CPU
+FIT_TIMEOUT = float(os.environ.get('ARIMA_FIT_TIMEOUT', 120))  # Seconds per task
+
+def resolve_workers(n_tasks, workers=None):
+    """Number of worker processes to use for a batch of tasks"""
+    workers = FIT_WORKERS if workers is None else workers
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    return max(1, min(workers, n_tasks))
+
+def _timed_out(timeout, deadline):
+    if deadline is not None and time.perf_counter() >= deadline:
+        return {'error': "Deadline passed"}
+    return {'error': f"Timed out after {timeout:.0f}s"}
+
+def _run_in_thread(func, args, timeout):
+    """func(*args) on a daemon thread, abandoned (not stopped) once timeout seconds pass"""
+    outcome = {}
+
+    def target():
+        try:
+            outcome['result'] = func(*args)
+        except Exception as e:
+            outcome['result'] = {'error': str(e)}
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    return outcome.get('result', {'error': f"Timed out after {timeout:.0f}s"})
+
+def _result_or_error(async_result):
+    """Value of a finished task, or {'error': ...} when it raised"""
+    try:
+        return async_result.get(timeout=0)
+    except Exception as e:
+        return {'error': str(e)}
+
+def run_tasks(func, tasks, workers=None, timeout=None, deadline=None):
+    """Run func(*args) for each (key, args) task in parallel, isolating failures per task
+
+    Returns (results, stats) where results maps each key to the task's return
+    value or to {'error': ...} when the task raised or timed out. A deadline
+    (a time.perf_counter() value) also bounds the whole batch.
+    """
+    timeout = FIT_TIMEOUT if timeout is None else timeout
+    workers = resolve_workers(len(tasks), workers)
+    results = {}
+    stats = {'workers': workers, 'wall_seconds': 0.0}
+
+    if not tasks:
+        return results, stats
+
+    start = time.perf_counter()
+
+    # Fork is required so workers inherit this module state instead of
+    # re-importing the API entry point. A pool is used even for one worker so
+    # timeouts and crashes stay contained; without fork, tasks run on threads
+    # that are abandoned at the timeout, which unblocks the caller but cannot
+    # stop the work
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        for key, args in tasks:
+            remaining = timeout if deadline is None else min(timeout, deadline - time.perf_counter())
+            results[key] = _run_in_thread(func, args, max(remaining, 0)) if remaining > 0 else _timed_out(timeout, deadline)
+        stats['wall_seconds'] = time.perf_counter() - start
+        return results, stats
+
+    context = multiprocessing.get_context('fork')
+    pending = list(tasks)
+    while pending:
+        pool = context.Pool(processes=min(workers, len(pending)))
+        batch_start = time.perf_counter()
+        try:
+            submitted = [(key, pool.apply_async(func, args), args) for key, args in pending]
+            pending = []
+
+            # Tasks queue behind each other in waves of `workers`, so each one gets
+            # its own timeout budget counted from the start of its wave
+            for position, (key, async_result, args) in enumerate(submitted):
+                wave = position // workers + 1
+                remaining = batch_start + timeout * wave - time.perf_counter()
+                if deadline is not None:
+                    remaining = min(remaining, deadline - time.perf_counter())
+                try:
+                    results[key] = async_result.get(timeout=max(remaining, 0))
+                except multiprocessing.TimeoutError:
+                    results[key] = _timed_out(timeout, deadline)
+                    # The timed-out task keeps its worker busy until the pool is
+                    # terminated, so restart the pool for the tasks still waiting
+                    for later_key, later_result, later_args in submitted[position + 1:]:
+                        if later_result.ready():
+                            results[later_key] = _result_or_error(later_result)
+                        elif deadline is not None and time.perf_counter() >= deadline:
+                            results[later_key] = _timed_out(timeout, deadline)
+                        else:
+                            pending.append((later_key, later_args))
+                    break
+                except Exception as e:
+                    results[key] = {'error': str(e)}
+        finally:
+            # Terminate rather than close so timed-out workers cannot outlive the batch
+            pool.terminate()
+            pool.join()
+
+    stats['wall_seconds'] = time.perf_counter() - start
+    return results, stats
+
+def print_timing_report(results, stats):
+    """Print per-task timings and the speedup over sequential execution"""
+    serial_seconds = sum(result.get('seconds', 0.0) for result in results.values())
+    wall_seconds = stats['wall_seconds']
+    speedup = serial_seconds / wall_seconds if wall_seconds > 0 else 1.0
+    succeeded = sum(1 for result in results.values() if not result.get('error'))
+
+    print(f"⏱️  {succeeded}/{len(results)} tasks succeeded on {stats['workers']} worker(s)")
+    for key, result in results.items():
+        status = f"failed ({result['error']})" if result.get('error') else "ok"
+        print(f"  {key}: {result.get('seconds', 0.0):.2f}s {status}")
+    print(f"  wall {wall_seconds:.2f}s vs serial {serial_seconds:.2f}s, speedup {speedup:.2f}x")
@@ -0,0 +1,155 @@
+# AVP Beach Volleyball Analytics Platform - ARIMA Forecasting
+# Model fitting, forecasting and diagnostics shared by the API and its worker processes
+
+import os
+import time
+import numpy as np
+import pandas as pd
+from datetime import timedelta
+from statistics import NormalDist
+from lazy_imports import lazy_import
+from metrics import timed
+from shared_arrays import share_arrays
+
+arima_model = lazy_import('statsmodels.tsa.arima.model')
+stattools = lazy_import('statsmodels.tsa.stattools')
+
+# Longest horizon computed per model; shorter requests are served as slices of it
+MAX_FORECAST_HORIZON = int(os.environ.get('ARIMA_MAX_HORIZON', 90))
+
+# Longest days_ahead accepted by /predict; longer forecasts are never kept in the cache
+PREDICT_MAX_DAYS = int(os.environ.get('ARIMA_PREDICT_MAX_DAYS', 365))
+
+# Forecast arrays per metric, valid for as long as the metric's model object is unchanged
+forecast_cache = {}
+
+def check_stationarity(timeseries):
+    """Check if time series is stationary using Augmented Dickey-Fuller test"""
+    result = stattools.adfuller(timeseries.dropna())
+    return {
+        'adf_statistic': result[0],
+        'p_value': result[1],
+        'critical_values': result[4],
+        'is_stationary': result[1] < 0.05
+    }
+
+def fit_arima_model(timeseries, order=(1, 1, 1)):
+    """Fit ARIMA model to time series data"""
+    try:
+        # Remove NaN values
+        clean_series = timeseries.dropna()
+
+        if len(clean_series) < 10:
+            return None, "Insufficient data for ARIMA modeling"
+
+        # Fit ARIMA model
+        model = arima_model.ARIMA(clean_series, order=order)
+        fitted_model = model.fit()
+
+        return fitted_model, None
+    except Exception as e:
+        return None, str(e)
+
+def refilter_model(model, timeseries):
+    """A fitted model's parameters filtered over another series, without re-estimating them"""
+    return arima_model.ARIMA(timeseries.dropna(), order=model.model.order).filter(model.params)
+
+def compute_forecast_arrays(model, steps):
+    """Run a single state-space prediction and keep its mean and variance for slicing"""
+    with timed('forecast'):
+        prediction = model.get_forecast(steps=steps)
+
+    return {
+        'mean': np.asarray(prediction.predicted_mean, dtype=float),
+        'variance': np.asarray(prediction.var_pred_mean, dtype=float),
+        'dates': pd.date_range(start=model.data.dates[-1] + timedelta(days=1), periods=steps, freq='D').strftime('%Y-%m-%d').tolist()
+    }
+
+def slice_forecast(arrays, steps, alpha=0.05):
+    """Build a forecast payload from the first steps days of precomputed forecast arrays"""
+    z = NormalDist().inv_cdf(1 - alpha / 2)
+    mean = arrays['mean'][:steps]
+    margin = z * np.sqrt(arrays['variance'][:steps])
+
+    return {
+        'forecast': mean.tolist(),
+        'lower_ci': (mean - margin).tolist(),
+        'upper_ci': (mean + margin).tolist(),
+        'dates': arrays['dates'][:steps]
+    }
+
+def generate_forecast(model, steps=30, alpha=0.05):
+    """Generate forecast using fitted ARIMA model"""
+    try:
+        return slice_forecast(compute_forecast_arrays(model, steps), steps, alpha)
+    except Exception:
+        return None
+
+def prime_forecast_cache(metric, model, arrays):
+    """Store precomputed forecast arrays for a metric's current model"""
+    forecast_cache[metric] = {'model': model, **arrays}
+
+def share_forecast_cache():
+    """Move every cached forecast's mean and variance into one shared read-only segment"""
+    entries = dict(forecast_cache)
+    shared = share_arrays({f"{metric}:{part}": entry[part] for metric, entry in entries.items() for part in ('mean', 'variance')}, 'forecasts')
+    for metric, entry in entries.items():
+        forecast_cache[metric] = dict(entry, mean=shared[f"{metric}:mean"], variance=shared[f"{metric}:variance"])
+
+def cached_forecast(metric, model, steps=30, alpha=0.05):
+    """Serve a forecast slice from the per-metric cache, recomputing only when the model changes"""
+    entry = forecast_cache.get(metric)
+    if entry is None or entry['model'] is not model or len(entry['mean']) < steps:
+        try:
+            arrays = compute_forecast_arrays(model, max(steps, MAX_FORECAST_HORIZON))
+        except Exception:
+            return None
+        if steps > PREDICT_MAX_DAYS:
+            return slice_forecast(arrays, steps, alpha)
+        prime_forecast_cache(metric, model, arrays)
+        entry = forecast_cache[metric]
+
+    return slice_forecast(entry, steps, alpha)
+
+def parse_prediction_args(data):
+    """Validate days_ahead and alpha of a prediction request into (days_ahead, alpha)"""
+    days_ahead = data.get('days_ahead', 7)
+    try:
+        # JSON true and 2.7 would convert silently, so only whole numbers are accepted
+        if isinstance(days_ahead, bool) or float(days_ahead) != int(float(days_ahead)):
+            raise ValueError
+        days_ahead = int(float(days_ahead))
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError("days_ahead must be an integer")
+    if not 1 <= days_ahead <= PREDICT_MAX_DAYS:
+        raise ValueError(f"days_ahead must be between 1 and {PREDICT_MAX_DAYS}")
+
+    alpha = data.get('alpha', 0.05)
+    try:
+        if isinstance(alpha, bool):
+            raise ValueError
+        alpha = float(alpha)
+    except (TypeError, ValueError):
+        raise ValueError("alpha must be a number")
+    if not 0 < alpha < 1:
+        raise ValueError("alpha must be between 0 and 1")
+    return days_ahead, alpha
+
+def fit_and_forecast(metric, timeseries, order, steps=MAX_FORECAST_HORIZON):
+    """Fit a model and forecast it in one task, timing the work for the fit pool"""
+    start = time.perf_counter()
+    model, error = fit_arima_model(timeseries, order)
+    forecast_arrays = None
+    if model:
+        try:
+            forecast_arrays = compute_forecast_arrays(model, steps)
+        except Exception as e:
+            error = f"Forecast failed: {e}"
+
+    return {
+        'metric': metric,
+        'model': model,
+        'forecast_arrays': forecast_arrays,
+        'error': error,
+        'seconds': time.perf_counter() - start
+    }
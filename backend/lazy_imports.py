@@ -0,0 +1,109 @@
+# AVP Beach Volleyball Analytics Platform - Lazy Imports
+# Defers heavy plotting and statistics modules until they are first used
+
+import importlib
+import os
+import re
+import subprocess
+import sys
+import types
+
+class LazyModule(types.ModuleType):
+    """Module proxy that imports the real module on first attribute access"""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__['_lazy_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_lazy_module']
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            self.__dict__['_lazy_module'] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = 'loaded' if self.__dict__['_lazy_module'] is not None else 'not loaded'
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+def lazy_import(name):
+    """Return a proxy for a module that is only imported when first used"""
+    if name in sys.modules:
+        return sys.modules[name]
+    return LazyModule(name)
+
+# Modules that must never be imported while an API worker boots
+LAZY_MODULES = ['matplotlib', 'seaborn', 'plotly', 'statsmodels.graphics.tsaplots']
+IMPORT_BUDGET_MS = float(os.environ.get('IMPORT_BUDGET_MS', 4000))
+
+_IMPORTTIME_LINE = re.compile(r'import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+def measure_import_times(module='api'):
+    """Import a module in a fresh interpreter under -X importtime and parse the timings
+
+    Returns a list of (module_name, self_us, cumulative_us, depth) tuples.
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True, cwd=os.getcwd(),
+        env={**os.environ, 'PYTHONPATH': os.path.dirname(os.path.abspath(__file__))}
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    timings = []
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            timings.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return timings
+
+def import_budget_report(module='api', budget_ms=None, top=15):
+    """Print the import cost of a module by package and check it against the budget
+
+    Returns True when no lazy module was imported and the time spent importing
+    dependencies stays within budget_ms.
+    """
+    budget_ms = IMPORT_BUDGET_MS if budget_ms is None else budget_ms
+    timings = measure_import_times(module)
+
+    # Self time of the module itself includes its startup work (data loading,
+    # model fitting), so only its dependencies count against the budget
+    by_package = {}
+    for name, self_us, _, _ in timings:
+        if name == module:
+            continue
+        package = name.split('.')[0]
+        by_package[package] = by_package.get(package, 0) + self_us
+    dependency_ms = sum(by_package.values()) / 1000
+
+    imported = {name for name, _, _, _ in timings}
+    violations = sorted(
+        lazy for lazy in LAZY_MODULES
+        if any(name == lazy or name.startswith(f"{lazy}.") for name in imported)
+    )
+
+    print(f"📦 Import time report for '{module}'")
+    for package, self_us in sorted(by_package.items(), key=lambda item: -item[1])[:top]:
+        print(f"  {package:<24} {self_us / 1000:8.1f} ms")
+    print(f"  {'total dependencies':<24} {dependency_ms:8.1f} ms (budget {budget_ms:.0f} ms)")
+
+    if violations:
+        print(f"❌ Lazy modules imported at boot: {', '.join(violations)}")
+    if dependency_ms > budget_ms:
+        print("❌ Import time budget exceeded")
+
+    ok = not violations and dependency_ms <= budget_ms
+    if ok:
+        print("✅ Import time within budget")
+    return ok
+
+if __name__ == "__main__":
+    sys.exit(0 if import_budget_report(*sys.argv[1:2]) else 1)
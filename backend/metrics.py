@@ -0,0 +1,188 @@
+# AVP Beach Volleyball Analytics Platform - Request Metrics
+# Per-route latency histograms and stage timings, exported in Prometheus text format
+
+import glob
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import Response, g, request
+
+# Directory shared by all gunicorn workers; each worker writes its own snapshot there
+METRICS_DIR = os.environ.get('METRICS_DIR', '')
+METRICS_FLUSH_SECONDS = float(os.environ.get('METRICS_FLUSH_SECONDS', 1.0))
+
+LATENCY_BUCKETS = [0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0]
+SIZE_BUCKETS = [256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304]
+
+# name -> (type, help, buckets)
+METRICS = {
+    'avp_http_requests_total': ('counter', "HTTP requests by route, method and status", None),
+    'avp_http_request_errors_total': ('counter', "HTTP requests answered with a 4xx or 5xx status", None),
+    'avp_http_request_duration_seconds': ('histogram', "HTTP request latency", LATENCY_BUCKETS),
+    'avp_http_response_size_bytes': ('histogram', "HTTP response body size", SIZE_BUCKETS),
+    'avp_stage_duration_seconds': ('histogram', "Time spent in internal stages (ARIMA fit, forecast, serialization)", LATENCY_BUCKETS)
+}
+
+_lock = threading.Lock()
+_counters = {}    # (name, labels) -> value
+_histograms = {}  # (name, labels) -> {'buckets': [...], 'sum': float, 'count': int}
+_last_flush = 0.0
+
+def _reset_lock():
+    # A fork taken while another thread held the lock (e.g. a background refit) would leave it locked
+    global _lock
+    _lock = threading.Lock()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_lock)
+
+def _labels_key(labels):
+    return tuple(sorted(labels.items()))
+
+def inc(name, labels, value=1):
+    """Add to a counter"""
+    key = (name, _labels_key(labels))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+def observe(name, labels, value):
+    """Record one observation in a histogram"""
+    buckets = METRICS[name][2]
+    key = (name, _labels_key(labels))
+    with _lock:
+        entry = _histograms.get(key)
+        if entry is None:
+            entry = {'buckets': [0] * len(buckets), 'sum': 0.0, 'count': 0}
+            _histograms[key] = entry
+        for i, bound in enumerate(buckets):
+            if value <= bound:
+                entry['buckets'][i] += 1
+                break
+        entry['sum'] += value
+        entry['count'] += 1
+
+def observe_stage(stage, seconds):
+    observe('avp_stage_duration_seconds', {'stage': stage}, seconds)
+
+@contextmanager
+def timed(stage):
+    """Time a block as an internal stage"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, time.perf_counter() - start)
+
+def _snapshot():
+    with _lock:
+        return {
+            'counters': [[name, list(map(list, labels)), value] for (name, labels), value in _counters.items()],
+            'histograms': [[name, list(map(list, labels)), dict(entry, buckets=list(entry['buckets']))]
+                           for (name, labels), entry in _histograms.items()]
+        }
+
+def flush():
+    """Write this worker's metrics to METRICS_DIR so any worker can serve the total"""
+    global _last_flush
+    if not METRICS_DIR:
+        return
+    os.makedirs(METRICS_DIR, exist_ok=True)
+    path = os.path.join(METRICS_DIR, f"worker-{os.getpid()}.json")
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(_snapshot(), f)
+    os.replace(tmp_path, path)
+    _last_flush = time.monotonic()
+
+def _merged():
+    """Counters and histograms summed over every worker snapshot"""
+    if not METRICS_DIR:
+        snapshots = [_snapshot()]
+    else:
+        flush()
+        snapshots = []
+        for path in glob.glob(os.path.join(METRICS_DIR, 'worker-*.json')):
+            try:
+                with open(path) as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+
+    counters = {}
+    histograms = {}
+    for snapshot in snapshots:
+        for name, labels, value in snapshot['counters']:
+            key = (name, tuple(map(tuple, labels)))
+            counters[key] = counters.get(key, 0) + value
+        for name, labels, entry in snapshot['histograms']:
+            key = (name, tuple(map(tuple, labels)))
+            total = histograms.setdefault(key, {'buckets': [0] * len(entry['buckets']), 'sum': 0.0, 'count': 0})
+            total['buckets'] = [a + b for a, b in zip(total['buckets'], entry['buckets'])]
+            total['sum'] += entry['sum']
+            total['count'] += entry['count']
+    return counters, histograms
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+def render():
+    """All metrics in the Prometheus text exposition format"""
+    counters, histograms = _merged()
+    lines = []
+    for name, (kind, help_text, buckets) in METRICS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        if kind == 'counter':
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f"{name}{_format_labels(labels)} {value}")
+        else:
+            for (metric, labels), entry in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(buckets, entry['buckets']):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_format_labels(labels, [('le', bound)])} {cumulative}")
+                lines.append(f"{name}_bucket{_format_labels(labels, [('le', '+Inf')])} {entry['count']}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {entry['sum']}")
+                lines.append(f"{name}_count{_format_labels(labels)} {entry['count']}")
+    return '\n'.join(lines) + '\n'
+
+def init_app(app):
+    """Record every request to app and serve the totals on /metrics"""
+
+    @app.before_request
+    def start_timer():
+        g.metrics_start = time.perf_counter()
+
+    @app.after_request
+    def record_request(response):
+        start = g.pop('metrics_start', None)
+        if start is None:
+            return response
+
+        # Label by the route pattern, not the raw path, to keep the series count bounded
+        labels = {'route': request.url_rule.rule if request.url_rule else 'unmatched', 'method': request.method}
+        inc('avp_http_requests_total', dict(labels, status=str(response.status_code)))
+        if response.status_code >= 400:
+            inc('avp_http_request_errors_total', labels)
+        observe('avp_http_request_duration_seconds', labels, time.perf_counter() - start)
+        if response.content_length is not None:
+            observe('avp_http_response_size_bytes', labels, response.content_length)
+
+        if METRICS_DIR and time.monotonic() - _last_flush >= METRICS_FLUSH_SECONDS:
+            flush()
+        return response
+
+    @app.route('/metrics')
+    def prometheus_metrics():
+        """Prometheus scrape endpoint"""
+        return Response(render(), mimetype='text/plain; version=0.0.4')
@@ -0,0 +1,150 @@
+# AVP Beach Volleyball Analytics Platform - ARIMA Model Cache
+# Persistent on-disk store for fitted ARIMA parameters
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import statsmodels
+
+CACHE_DIR = os.environ.get('ARIMA_CACHE_DIR', os.path.join('data', 'model_cache'))
+CACHE_FORMAT_VERSION = 1
+
+def model_cache_key(timeseries, order):
+    """Build a cache key from the series contents, ARIMA order and statsmodels version"""
+    clean_series = timeseries.dropna()
+    digest = hashlib.sha256()
+    digest.update(f"v{CACHE_FORMAT_VERSION}|statsmodels={statsmodels.__version__}|order={tuple(order)}|".encode())
+    digest.update(pd.util.hash_pandas_object(clean_series, index=True).values.tobytes())
+    return digest.hexdigest()
+
+def _artifact_path(metric, key):
+    """Path of the artifact file for a metric and cache key"""
+    return os.path.join(CACHE_DIR, f"{metric}-{key[:16]}.npz")
+
+def load_cached_model(metric, timeseries, order):
+    """Rebuild a fitted ARIMA model from cached parameters, or return None on a miss"""
+    from statsmodels.tsa.arima.model import ARIMA
+
+    key = model_cache_key(timeseries, order)
+    path = _artifact_path(metric, key)
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with np.load(path, allow_pickle=False) as artifact:
+            if str(artifact['key']) != key:
+                return None
+            params = artifact['params']
+
+        # Re-running the Kalman filter at fixed parameters restores the full
+        # results state without repeating the likelihood optimisation
+        model = ARIMA(timeseries.dropna(), order=order)
+        return model.filter(params)
+    except Exception as e:
+        print(f"⚠️  Ignoring unreadable cache artifact {path}: {e}")
+        return None
+
+def store_cached_model(metric, timeseries, order, fitted_model):
+    """Persist the parameters of a fitted ARIMA model, replacing stale artifacts for the metric"""
+    key = model_cache_key(timeseries, order)
+    path = _artifact_path(metric, key)
+
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+
+        # Write to a temporary file first so concurrent workers never read a partial artifact
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(
+                f,
+                key=np.array(key),
+                order=np.array(order),
+                params=np.asarray(fitted_model.params, dtype=float),
+                param_names=np.array(fitted_model.model.param_names)
+            )
+        os.replace(tmp_path, path)
+
+        for filename in os.listdir(CACHE_DIR):
+            stale_path = os.path.join(CACHE_DIR, filename)
+            if filename.startswith(f"{metric}-") and filename.endswith('.npz') and stale_path != path:
+                os.remove(stale_path)
+    except OSError as e:
+        print(f"⚠️  Could not write cache artifact for {metric}: {e}")
+
+def _orders_path():
+    """Path of the JSON file memoizing automatically selected orders"""
+    return os.path.join(CACHE_DIR, 'selected_orders.json')
+
+def _read_selected_orders():
+    try:
+        with open(_orders_path()) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def load_selected_order(metric, timeseries, search_tag):
+    """Return the memoized order selected for this series and search space, if any"""
+    entry = _read_selected_orders().get(metric)
+    if entry and entry['key'] == model_cache_key(timeseries, search_tag):
+        return tuple(entry['order'])
+    return None
+
+def store_selected_order(metric, timeseries, search_tag, order):
+    """Memoize the order selected for a series under the given search space"""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        selected = _read_selected_orders()
+        selected[metric] = {'key': model_cache_key(timeseries, search_tag), 'order': list(order)}
+
+        tmp_path = f"{_orders_path()}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(selected, f, indent=2)
+        os.replace(tmp_path, _orders_path())
+    except OSError as e:
+        print(f"⚠️  Could not memoize selected order for {metric}: {e}")
+
+def clear_cache():
+    """Remove all cached model artifacts"""
+    if not os.path.isdir(CACHE_DIR):
+        return 0
+
+    removed = 0
+    for filename in os.listdir(CACHE_DIR):
+        if filename.endswith('.npz') or filename == 'selected_orders.json':
+            os.remove(os.path.join(CACHE_DIR, filename))
+            removed += 1
+    return removed
+
+def print_cache_report(report):
+    """Print per-metric cache hit/miss status"""
+    hits = sum(1 for status in report.values() if status == 'hit')
+    print(f"🗄️  ARIMA model cache ({CACHE_DIR}): {hits}/{len(report)} hits")
+    for metric, status in report.items():
+        print(f"  {metric}: {status}")
+
+def main():
+    """Pre-bake the ARIMA model cache, e.g. at image build time"""
+    parser = argparse.ArgumentParser(description="Manage the on-disk ARIMA model cache")
+    parser.add_argument('--clear', action='store_true', help="remove existing artifacts before warming")
+    parser.add_argument('--auto-order', action='store_true', help="select ARIMA orders by stepwise AIC search")
+    args = parser.parse_args()
+
+    if args.clear:
+        print(f"🧹 Removed {clear_cache()} cached artifacts")
+    if args.auto_order:
+        os.environ['ARIMA_AUTO_ORDER'] = '1'
+
+    # Importing the API initializes the ARIMA system, which fills the cache
+    # and prints the per-metric report
+    import api
+
+    if any(status == 'failed' for status in api.snapshot['cache_report'].values()):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
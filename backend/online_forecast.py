@@ -0,0 +1,237 @@
+# AVP Beach Volleyball Analytics Platform - Online Forecasting
+# Kalman filter updates of fitted ARIMA state-space models for live in-tournament observations
+
+import copy
+import os
+import threading
+from datetime import timedelta
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+ONLINE_DRIFT_THRESHOLD = float(os.environ.get('ONLINE_DRIFT_THRESHOLD', 4.0))  # Mean squared standardized error that triggers a refit
+ONLINE_DRIFT_HALFLIFE = float(os.environ.get('ONLINE_DRIFT_HALFLIFE', 10))     # Observations for an error's weight to halve
+ONLINE_DRIFT_MIN_UPDATES = int(os.environ.get('ONLINE_DRIFT_MIN_UPDATES', 5))  # Updates before drift can be declared
+
+class OnlineForecaster:
+    """Filtered state of one fitted ARIMA model, advanced one observation at a time
+
+    The system matrices are frozen at the fitted parameters, so each update is
+    one Kalman filter step: O(k^2) in the number of states k and independent of
+    the history length. Drift is tracked as an exponentially weighted mean of
+    squared standardized one-step errors, which stays near 1 while the model fits.
+    """
+
+    def __init__(self, results):
+        filter_results = results.filter_results
+        self.design = filter_results.design[..., -1]
+        self.obs_intercept = filter_results.obs_intercept[..., -1]
+        self.obs_cov = filter_results.obs_cov[..., -1]
+        self.transition = filter_results.transition[..., -1]
+        self.state_intercept = filter_results.state_intercept[..., -1]
+        self.selection = filter_results.selection[..., -1]
+        self.disturbance_cov = filter_results.state_cov[..., -1]
+        self.state_noise = self.selection @ self.disturbance_cov @ self.selection.T
+
+        # Prediction for the first observation after the fitted sample
+        self.state = np.array(filter_results.predicted_state[:, -1])
+        self.state_cov = np.array(filter_results.predicted_state_cov[:, :, -1])
+        self.last_date = pd.Timestamp(results.model.data.dates[-1])
+        self.last_value = float(np.ravel(results.model.endog)[-1])
+
+        self.updates = 0
+        self.drift_score = 1.0
+        self.drift_reported = False
+        self._previous = None
+
+    @property
+    def next_date(self):
+        return self.last_date + timedelta(days=1)
+
+    @property
+    def drifting(self):
+        return self.updates >= ONLINE_DRIFT_MIN_UPDATES and self.drift_score > ONLINE_DRIFT_THRESHOLD
+
+    def update(self, value, revise=False):
+        """Filter one observation and predict the next state; returns the standardized one-step error
+
+        With revise, the observation replaces the last one (an intra-day correction)
+        by restoring the state from before it, so revisions are also O(1).
+        """
+        if revise:
+            (self.state, self.state_cov, self.drift_score, self.updates, self.last_date, self.last_value) = self._previous
+        self._previous = (self.state, self.state_cov, self.drift_score, self.updates, self.last_date, self.last_value)
+
+        error = value - (self.design @ self.state + self.obs_intercept)[0]
+        gain_cov = self.state_cov @ self.design.T
+        variance = (self.design @ gain_cov + self.obs_cov)[0, 0]
+        gain = gain_cov[:, 0] / variance
+
+        filtered_state = self.state + gain * error
+        filtered_cov = self.state_cov - np.outer(gain, gain) * variance
+        self.state = self.transition @ filtered_state + self.state_intercept
+        self.state_cov = self.transition @ filtered_cov @ self.transition.T + self.state_noise
+
+        standardized = float(error / np.sqrt(variance))
+        weight = 1 - 0.5 ** (1 / ONLINE_DRIFT_HALFLIFE)
+        self.drift_score = float(self.drift_score + weight * (standardized ** 2 - self.drift_score))
+        self.updates += 1
+        self.last_date = self.next_date
+        self.last_value = float(value)
+        return standardized
+
+    def forecast(self, steps=30, alpha=0.05):
+        """Forecast payload from the current state, in the same form as forecasting.slice_forecast"""
+        mean = np.empty(steps)
+        variance = np.empty(steps)
+        state, state_cov = self.state, self.state_cov
+        for step in range(steps):
+            mean[step] = (self.design @ state + self.obs_intercept)[0]
+            variance[step] = (self.design @ state_cov @ self.design.T + self.obs_cov)[0, 0]
+            state = self.transition @ state + self.state_intercept
+            state_cov = self.transition @ state_cov @ self.transition.T + self.state_noise
+
+        margin = NormalDist().inv_cdf(1 - alpha / 2) * np.sqrt(variance)
+        return {
+            'forecast': mean.tolist(),
+            'lower_ci': (mean - margin).tolist(),
+            'upper_ci': (mean + margin).tolist(),
+            'dates': pd.date_range(self.next_date, periods=steps, freq='D').strftime('%Y-%m-%d').tolist()
+        }
+
+class OnlineEngine:
+    """Online forecasters for the models of the live snapshot
+
+    Live observations are provisional: a metric's latest day may be revised
+    any number of times, and the final row for a day arrives through
+    /observations. When a new snapshot is published the forecasters are rebuilt
+    from its models and the live observations it does not cover yet are
+    replayed. on_drift is called once per forecaster when its errors stop
+    matching the model.
+    """
+
+    def __init__(self, on_drift=None):
+        self.on_drift = on_drift
+        self.version = 0  # Bumped on every change, so cached /forecast responses can key on it
+        self._lock = threading.Lock()
+        self._models = {}
+        self._forecasters = {}
+        self._live = {}  # metric -> {date: value} observed since the models were published
+
+    def reset(self, models, estimated_through=None):
+        """Switch to a new set of fitted models, replaying live observations they do not include
+
+        estimated_through maps a metric to the last live date its new parameters
+        were estimated on; errors up to that date are in-sample, so they restart
+        the drift score instead of counting as drift.
+        """
+        estimated_through = estimated_through or {}
+        with self._lock:
+            self._models = models
+            self._forecasters = {}
+            for metric in list(self._live):
+                if metric not in models:
+                    del self._live[metric]
+                    continue
+                forecaster = OnlineForecaster(models[metric])
+                pending = {date: value for date, value in self._live[metric].items() if date > forecaster.last_date}
+                for date in sorted(pending):
+                    if date != forecaster.next_date:
+                        break
+                    forecaster.update(pending[date])
+                    if metric in estimated_through and date <= estimated_through[metric]:
+                        forecaster.drift_score = 1.0
+                if forecaster.updates:
+                    # Drift already seen before the reset must not trigger another refit
+                    forecaster.drift_reported = forecaster.drifting
+                    self._forecasters[metric] = forecaster
+                    self._live[metric] = {date: value for date, value in pending.items() if date <= forecaster.last_date}
+                else:
+                    del self._live[metric]
+            self.version += 1
+
+    def update(self, date, values):
+        """Apply each metric's observation for date, either the next day or a revision of the latest one
+
+        Every metric is validated before any state changes; raises ValueError
+        when a metric has no model, a value is not a finite number or the date
+        is neither the metric's next day nor its latest live day.
+        """
+        date = pd.Timestamp(date)
+        with self._lock:
+            pending = {}
+            for metric in values:
+                if metric not in self._models:
+                    raise ValueError(f"No model for {metric}")
+                forecaster = self._forecasters.get(metric) or OnlineForecaster(self._models[metric])
+                revise = forecaster.updates > 0 and date == forecaster.last_date
+                if not revise and date != forecaster.next_date:
+                    raise ValueError(f"Next observation for {metric} must be dated {forecaster.next_date.strftime('%Y-%m-%d')}")
+                try:
+                    value = float(values[metric])
+                except (TypeError, ValueError):
+                    raise ValueError(f"Observation for {metric} must be a number")
+                if not np.isfinite(value):
+                    raise ValueError(f"Observation for {metric} must be finite")
+                pending[metric] = (forecaster, value, revise)
+
+            results = {}
+            drifted = []
+            for metric, (forecaster, value, revise) in pending.items():
+                standardized_error = forecaster.update(value, revise=revise)
+                self._forecasters[metric] = forecaster
+                self._live.setdefault(metric, {})[date] = value
+                if forecaster.drifting and not forecaster.drift_reported:
+                    forecaster.drift_reported = True
+                    drifted.append(metric)
+                results[metric] = {
+                    'revised': revise,
+                    'standardized_error': round(standardized_error, 4),
+                    'drift_score': round(forecaster.drift_score, 4),
+                    'drifting': forecaster.drifting
+                }
+            self.version += 1
+
+        if drifted and self.on_drift:
+            print(f"📉 Forecast drift detected for {', '.join(drifted)}; requesting a refit")
+            self.on_drift()
+        return results
+
+    def live_observations(self):
+        """Live observations per metric as date-indexed series, in date order"""
+        with self._lock:
+            return {
+                metric: pd.Series(observed, dtype=float).sort_index()
+                for metric, observed in self._live.items() if observed
+            }
+
+    def forecaster(self, metric):
+        """Copy of the current state for a metric: its live forecaster, or a fresh one from the model"""
+        with self._lock:
+            forecaster = self._forecasters.get(metric)
+            if forecaster is None:
+                return OnlineForecaster(self._models[metric]) if metric in self._models else None
+            # update() replaces the arrays rather than writing into them, so a shallow copy is independent
+            return copy.copy(forecaster)
+
+    def forecast(self, metric, steps=30, alpha=0.05):
+        """(forecast, latest live value) for a metric with live observations, or None"""
+        with self._lock:
+            forecaster = self._forecasters.get(metric)
+            if forecaster is None:
+                return None
+            return forecaster.forecast(steps, alpha), forecaster.last_value
+
+    def describe(self):
+        """Live state per metric"""
+        with self._lock:
+            return {
+                metric: {
+                    'last_date': forecaster.last_date.strftime('%Y-%m-%d'),
+                    'updates': forecaster.updates,
+                    'drift_score': round(forecaster.drift_score, 4),
+                    'drifting': forecaster.drifting
+                }
+                for metric, forecaster in self._forecasters.items()
+            }
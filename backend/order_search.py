@@ -0,0 +1,153 @@
+# AVP Beach Volleyball Analytics Platform - ARIMA Order Selection
+# Stepwise AIC search over (p, d, q) run in parallel across candidates and metrics
+
+import math
+import os
+import time
+
+from diagnostics import get_diagnostics
+from fit_pool import run_tasks
+from forecasting import check_stationarity, fit_arima_model
+from model_cache import load_selected_order, store_selected_order
+
+AUTO_ORDER = os.environ.get('ARIMA_AUTO_ORDER', '0') == '1'
+SEARCH_BUDGET = float(os.environ.get('ARIMA_ORDER_SEARCH_BUDGET', 60))  # Seconds for all metrics
+
+MAX_P = 3
+MAX_D = 2
+MAX_Q = 3
+MAX_ORDER = 5  # Upper bound on p + q
+
+def search_space_tag():
+    """Identifier of the search settings, memoized alongside the selected orders"""
+    return ('auto', MAX_P, MAX_D, MAX_Q, MAX_ORDER)
+
+def select_differencing(metric, timeseries, max_d=MAX_D):
+    """Pick d as the number of differences needed for the ADF test to reject a unit root"""
+    # The undifferenced test is read from the diagnostics cache shared with /stationarity when present
+    if get_diagnostics(metric, timeseries)['adf']['is_stationary']:
+        return 0
+
+    series = timeseries.dropna().diff().dropna()
+    for d in range(1, max_d + 1):
+        if len(series) < 10 or check_stationarity(series)['is_stationary']:
+            return d
+        series = series.diff().dropna()
+    return max_d
+
+def differencing_task(metric, timeseries):
+    """select_differencing as a fit-pool task"""
+    start = time.perf_counter()
+    return {'d': select_differencing(metric, timeseries), 'seconds': time.perf_counter() - start}
+
+def score_order(timeseries, order):
+    """Fit a candidate order and return its AIC (infinite when the fit fails)"""
+    start = time.perf_counter()
+    model, error = fit_arima_model(timeseries, order)
+
+    return {
+        'aic': model.aic if model else math.inf,
+        'error': error,
+        'seconds': time.perf_counter() - start
+    }
+
+def _neighbours(p, q):
+    """Stepwise moves around (p, q), pruned to the search bounds"""
+    moves = [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (1, 1)]
+    candidates = []
+    for dp, dq in moves:
+        new_p, new_q = p + dp, q + dq
+        if 0 <= new_p <= MAX_P and 0 <= new_q <= MAX_Q and new_p + new_q <= MAX_ORDER:
+            candidates.append((new_p, new_q))
+    return candidates
+
+def select_orders(series_by_metric, default_orders, budget=None, workers=None):
+    """Choose an ARIMA order per metric by stepwise AIC search within a time budget
+
+    Returns (orders, report). Metrics whose search does not converge before the
+    budget runs out keep their entry from default_orders. The differencing tests
+    and every candidate fit run in the pool and count against the budget.
+    """
+    budget = SEARCH_BUDGET if budget is None else budget
+    deadline = time.perf_counter() + budget
+    orders = {}
+    report = {}
+    searches = {}
+    unsearched = {}  # metric -> why its differencing test gave no d
+
+    differencing_tasks = []
+    for metric, timeseries in series_by_metric.items():
+        memoized = load_selected_order(metric, timeseries, search_space_tag())
+        if memoized:
+            orders[metric] = memoized
+            report[metric] = 'memoized'
+        else:
+            differencing_tasks.append((metric, (metric, timeseries)))
+
+    differencing, _ = run_tasks(differencing_task, differencing_tasks, workers=workers, deadline=deadline)
+    for metric, result in differencing.items():
+        if 'd' not in result:
+            unsearched[metric] = result['error']
+            continue
+        searches[metric] = {
+            'd': result['d'],
+            'best': None,
+            'best_aic': math.inf,
+            'tried': set(),
+            'frontier': [(2, 2), (0, 0), (1, 0), (0, 1)]
+        }
+
+    while searches:
+        if time.perf_counter() >= deadline:
+            break
+
+        # One batch holds the current frontier of every metric still searching
+        tasks = []
+        for metric, search in searches.items():
+            for p, q in search['frontier']:
+                if (p, q) not in search['tried']:
+                    search['tried'].add((p, q))
+                    tasks.append(((metric, p, q), (series_by_metric[metric], (p, search['d'], q))))
+        if not tasks:
+            break
+
+        results, _ = run_tasks(score_order, tasks, workers=workers, deadline=deadline)
+        if time.perf_counter() >= deadline:
+            # Candidates cut off by the deadline say nothing about convergence
+            break
+
+        for metric in list(searches):
+            search = searches[metric]
+            previous_best = search['best']
+            for (result_metric, p, q), result in results.items():
+                if result_metric == metric and result.get('aic', math.inf) < search['best_aic']:
+                    search['best'] = (p, q)
+                    search['best_aic'] = result['aic']
+
+            if search['best'] is not None and search['best'] != previous_best:
+                search['frontier'] = _neighbours(*search['best'])
+            else:
+                # No candidate improved on the current best, so the search has converged
+                if search['best'] is not None:
+                    p, q = search['best']
+                    orders[metric] = (p, search['d'], q)
+                    report[metric] = f"searched ({len(search['tried'])} candidates, AIC {search['best_aic']:.1f})"
+                    store_selected_order(metric, series_by_metric[metric], search_space_tag(), orders[metric])
+                del searches[metric]
+
+    for metric in series_by_metric:
+        if metric not in orders:
+            orders[metric] = default_orders[metric]
+            if metric in unsearched:
+                reason = f"differencing test: {unsearched[metric]}"
+            else:
+                reason = 'budget exhausted' if metric in searches else 'no candidate fitted'
+            report[metric] = f"default ({reason})"
+
+    return {metric: orders[metric] for metric in series_by_metric}, report
+
+def print_order_report(orders, report):
+    """Print the selected order and how it was chosen for each metric"""
+    print("🔎 ARIMA order selection:")
+    for metric, order in orders.items():
+        print(f"  {metric}: {order} {report[metric]}")
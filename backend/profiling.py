@@ -0,0 +1,134 @@
+# AVP Beach Volleyball Analytics Platform - Request Profiling
+# Opt-in cProfile capture of single requests or a sampled fraction, kept in a rolling store
+
+import cProfile
+import hmac
+import io
+import os
+import pstats
+import random
+import re
+import time
+from datetime import datetime
+
+from flask import Response, abort, g, jsonify, request, send_file
+
+PROFILE_TOKEN = os.environ.get('PROFILE_TOKEN', '')
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', 0))
+PROFILE_DIR = os.environ.get('PROFILE_DIR', os.path.join('data', 'profiles'))
+PROFILE_KEEP = int(os.environ.get('PROFILE_KEEP', 50))
+
+PROFILE_NAME = re.compile(r'^[\w.-]+\.pstats$')
+
+def _authorized():
+    """True when the request carries the admin token"""
+    token = request.headers.get('X-Profile-Token') or request.args.get('profile_token', '')
+    return bool(PROFILE_TOKEN) and hmac.compare_digest(token, PROFILE_TOKEN)
+
+def _requested():
+    """True when the client explicitly asked for this request to be profiled"""
+    return request.headers.get('X-Profile') == '1' or request.args.get('profile') == '1'
+
+def _prune():
+    """Keep only the newest PROFILE_KEEP profiles"""
+    profiles = sorted(
+        (entry for entry in os.scandir(PROFILE_DIR) if PROFILE_NAME.match(entry.name)),
+        key=lambda entry: entry.stat().st_mtime
+    )
+    for entry in profiles[:-PROFILE_KEEP or None]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+
+def save_profile(profiler, seconds):
+    """Dump a profile as a pstats file named after the route, returning the file name"""
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    slug = re.sub(r'[^\w]+', '_', route).strip('_') or 'root'
+    name = f"{datetime.now():%Y%m%d-%H%M%S-%f}-{request.method}-{slug}-{seconds * 1000:.0f}ms.pstats"
+
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    profiler.dump_stats(os.path.join(PROFILE_DIR, name))
+    _prune()
+    return name
+
+def profile_summary(path, limit=40):
+    """Top functions of a saved profile by cumulative time, as text"""
+    out = io.StringIO()
+    pstats.Stats(path, stream=out).sort_stats('cumulative').print_stats(limit)
+    return out.getvalue()
+
+def init_app(app):
+    """Profile requests that opt in with the admin token, or a sampled fraction of all requests
+
+    Nothing is registered unless PROFILE_TOKEN or PROFILE_SAMPLE_RATE is set,
+    so profiling costs nothing when it is off.
+    """
+    if not PROFILE_TOKEN and PROFILE_SAMPLE_RATE <= 0:
+        return
+
+    @app.before_request
+    def start_profile():
+        explicit = _requested() and _authorized()
+        if not explicit and not (PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE):
+            return
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is already active on this interpreter
+            return
+        g.profile = {'profiler': profiler, 'explicit': explicit, 'start': time.perf_counter()}
+
+    @app.after_request
+    def finish_profile(response):
+        profile = g.pop('profile', None)
+        if profile is None:
+            return response
+
+        profile['profiler'].disable()
+        seconds = time.perf_counter() - profile['start']
+        name = save_profile(profile['profiler'], seconds)
+        if profile['explicit']:
+            response.headers['X-Profile-File'] = name
+            response.headers['X-Profile-Ms'] = f"{seconds * 1000:.1f}"
+        return response
+
+    @app.teardown_request
+    def stop_profile(error=None):
+        # after_request is skipped when a handler raises; never leave the profiler running
+        profile = g.pop('profile', None)
+        if profile is not None:
+            profile['profiler'].disable()
+
+    @app.route('/profiles')
+    def list_profiles():
+        """List stored profiles, newest first"""
+        if not _authorized():
+            abort(403)
+        if not os.path.isdir(PROFILE_DIR):
+            return jsonify({"profiles": []})
+
+        entries = sorted(
+            (entry for entry in os.scandir(PROFILE_DIR) if PROFILE_NAME.match(entry.name)),
+            key=lambda entry: entry.stat().st_mtime, reverse=True
+        )
+        return jsonify({
+            "profiles": [{"name": entry.name, "bytes": entry.stat().st_size} for entry in entries],
+            "sample_rate": PROFILE_SAMPLE_RATE,
+            "keep": PROFILE_KEEP
+        })
+
+    @app.route('/profiles/<name>')
+    def get_profile(name):
+        """Download a stored profile, or ?format=text for the top functions"""
+        if not _authorized():
+            abort(403)
+        path = os.path.join(PROFILE_DIR, name)
+        if not PROFILE_NAME.match(name) or not os.path.exists(path):
+            abort(404)
+
+        if request.args.get('format') == 'text':
+            return Response(profile_summary(path), mimetype='text/plain')
+        return send_file(os.path.abspath(path), mimetype='application/octet-stream', as_attachment=True, download_name=name)
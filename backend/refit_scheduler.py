@@ -0,0 +1,110 @@
+# AVP Beach Volleyball Analytics Platform - Background Refits
+# Daemon thread that rebuilds the model snapshot on a schedule or after the data changes
+
+import os
+import threading
+import time
+from datetime import datetime
+
+REFIT_INTERVAL = float(os.environ.get('REFIT_INTERVAL_SECONDS', 0))     # 0 = no scheduled refits
+REFIT_ON_CHANGE = os.environ.get('REFIT_ON_CHANGE', '1') == '1'
+REFIT_MIN_GAP = float(os.environ.get('REFIT_MIN_GAP_SECONDS', 60))      # Debounce for change-triggered refits
+
+class RefitScheduler:
+    """Runs refit() on a daemon thread when it is due, one refit at a time
+
+    A refit is due every REFIT_INTERVAL seconds, and after notify_change() once
+    REFIT_MIN_GAP seconds have passed since the previous refit, so a burst of
+    new observations causes a single refit.
+    """
+
+    def __init__(self, refit, interval=REFIT_INTERVAL, on_change=REFIT_ON_CHANGE, min_gap=REFIT_MIN_GAP):
+        self.refit = refit
+        self.interval = interval
+        self.on_change = on_change
+        self.min_gap = min_gap
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._changed = False
+        self._forced = False
+        self._last_run = time.monotonic()
+        self._thread = None
+        self.status = {
+            'running': False,
+            'refits': 0,
+            'last_started': None,
+            'last_seconds': None,
+            'last_error': None
+        }
+
+    @property
+    def enabled(self):
+        return self.interval > 0 or self.on_change
+
+    def start(self):
+        """Start the scheduler thread if any trigger is enabled"""
+        if not self.enabled or (self._thread and self._thread.is_alive()):
+            return
+        self._thread = threading.Thread(target=self._run, name='refit-scheduler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def notify_change(self):
+        """Record that the data changed since the last snapshot"""
+        if self.on_change:
+            self._changed = True
+            self._wake.set()
+
+    def trigger(self):
+        """Refit as soon as possible"""
+        self._forced = True
+        self._wake.set()
+
+    def _seconds_until_due(self):
+        elapsed = time.monotonic() - self._last_run
+        waits = []
+        if self._forced:
+            waits.append(0.0)
+        if self._changed:
+            waits.append(self.min_gap - elapsed)
+        if self.interval > 0:
+            waits.append(self.interval - elapsed)
+        return max(min(waits), 0.0) if waits else None
+
+    def _run(self):
+        while not self._stop.is_set():
+            wait = self._seconds_until_due()
+            if wait is None or wait > 0:
+                self._wake.wait(wait)
+                self._wake.clear()
+                continue
+
+            self._changed = False
+            self._forced = False
+            self.status.update(running=True, last_started=datetime.now().isoformat())
+            start = time.monotonic()
+            try:
+                self.refit()
+                self.status['last_error'] = None
+            except Exception as e:
+                self.status['last_error'] = str(e)
+                print(f"⚠️  Background refit failed: {e}")
+            finally:
+                self._last_run = time.monotonic()
+                self.status.update(running=False, last_seconds=round(self._last_run - start, 3))
+                self.status['refits'] += 1
+
+    def describe(self):
+        """Scheduler settings and the outcome of the last refit"""
+        wait = self._seconds_until_due()
+        return {
+            **self.status,
+            'enabled': self.enabled,
+            'interval_seconds': self.interval,
+            'on_change': self.on_change,
+            'pending_change': self._changed,
+            'next_refit_in_seconds': round(wait, 1) if wait is not None and self._thread else None
+        }
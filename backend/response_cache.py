@@ -0,0 +1,67 @@
+# AVP Beach Volleyball Analytics Platform - Response Cache
+# Pre-serialized JSON responses with strong ETags, conditional GET and gzip
+
+import gzip
+import hashlib
+import os
+from collections import OrderedDict
+
+from flask import Response, current_app, request
+
+from metrics import timed
+
+RESPONSE_GZIP = os.environ.get('RESPONSE_GZIP', '1') == '1'
+try:
+    RESPONSE_CACHE_SIZE = max(int(os.environ.get('RESPONSE_CACHE_SIZE', 256)), 0)  # 0 = render every response
+except ValueError:
+    print(f"⚠️  Ignoring invalid RESPONSE_CACHE_SIZE={os.environ['RESPONSE_CACHE_SIZE']!r}; using 256")
+    RESPONSE_CACHE_SIZE = 256
+GZIP_MIN_BYTES = 1024
+
+# Rendered bodies per cache key, each valid for a single data version, least recently used first
+_rendered = OrderedDict()
+
+def _render(key, version, build):
+    """Serialize a payload once per data version and remember its encodings"""
+    entry = _rendered.get(key)
+    if entry is None or entry['version'] != version:
+        payload = build()
+        with timed('json_encode'):
+            body = current_app.json.dumps(payload, separators=(',', ':')).encode('utf-8') + b'\n'
+        entry = {
+            'version': version,
+            'body': body,
+            'etag': hashlib.sha256(body).hexdigest()[:32],
+            'gzip': gzip.compress(body, compresslevel=6) if RESPONSE_GZIP and len(body) >= GZIP_MIN_BYTES else None
+        }
+        if not RESPONSE_CACHE_SIZE:
+            return entry
+        _rendered[key] = entry
+        while len(_rendered) > RESPONSE_CACHE_SIZE:
+            _rendered.popitem(last=False)
+    _rendered.move_to_end(key)
+    return entry
+
+def cached_json_response(key, version, build):
+    """Serve build() as JSON, rendering it only when version changes
+
+    Clients that send a matching If-None-Match get an empty 304, and clients
+    that accept gzip get the pre-compressed body.
+    """
+    entry = _render(key, version, build)
+
+    if entry['gzip'] is not None and 'gzip' in request.accept_encodings:
+        # Each encoding is a different representation, so it needs its own strong ETag
+        response = Response(entry['gzip'], mimetype='application/json')
+        response.headers['Content-Encoding'] = 'gzip'
+        response.set_etag(f"{entry['etag']}-gz")
+    else:
+        response = Response(entry['body'], mimetype='application/json')
+        response.set_etag(entry['etag'])
+
+    response.vary.add('Accept-Encoding')
+    return response.make_conditional(request)
+
+def clear_response_cache():
+    """Drop all rendered responses"""
+    _rendered.clear()
@@ -0,0 +1,150 @@
+# AVP Beach Volleyball Analytics Platform - Rollup Pyramid
+# Weekly, monthly and season aggregates built once per data version and extended as days are appended
+
+import numpy as np
+import pandas as pd
+
+from timeseries_query import QueryError, parse_date, parse_metrics
+
+# Query frequency -> pandas period frequency; an AVP season runs within a calendar year
+ROLLUP_FREQS = {'W': 'W', 'M': 'M', 'season': 'Y'}
+ROLLUP_STATS = ('sum', 'mean', 'min', 'max')
+
+class RollupLevel:
+    """count, sum, min and max of every column per period, in period order"""
+
+    def __init__(self, freq, n_columns):
+        self.freq = freq
+        self.ordinals = np.empty(0, dtype=np.int64)
+        self.first = np.empty(0, dtype='datetime64[ns]')  # Earliest date in each bucket
+        self.count = np.empty(0, dtype=np.int64)
+        self.sum = np.empty((0, n_columns))
+        self.min = np.empty((0, n_columns))
+        self.max = np.empty((0, n_columns))
+
+    def __len__(self):
+        return len(self.ordinals)
+
+    def ordinals_of(self, dates):
+        return dates.to_period(self.freq).asi8
+
+    def fold(self, ordinals, first, count, sums, mins, maxs):
+        """Merge pre-aggregated rows, sorted by period and not before the last bucket, into the level"""
+        if len(ordinals) == 0:
+            return
+        starts = np.flatnonzero(np.r_[True, ordinals[1:] != ordinals[:-1]])
+        new = {
+            'ordinals': ordinals[starts],
+            'first': first[starts],
+            'count': np.add.reduceat(count, starts),
+            'sum': np.add.reduceat(sums, starts, axis=0),
+            'min': np.minimum.reduceat(mins, starts, axis=0),
+            'max': np.maximum.reduceat(maxs, starts, axis=0)
+        }
+
+        if len(self) and new['ordinals'][0] == self.ordinals[-1]:
+            # The first new group continues the current period, e.g. a day appended mid-week
+            self.count[-1] += new['count'][0]
+            self.sum[-1] += new['sum'][0]
+            self.min[-1] = np.minimum(self.min[-1], new['min'][0])
+            self.max[-1] = np.maximum(self.max[-1], new['max'][0])
+            new = {name: values[1:] for name, values in new.items()}
+
+        if len(new['ordinals']):
+            for name, values in new.items():
+                setattr(self, name, np.concatenate([getattr(self, name), values]))
+
+    def bounds(self, start=None, end=None):
+        """Buckets [lo, hi) whose period overlaps the dates start..end"""
+        lo = np.searchsorted(self.ordinals, start.to_period(self.freq).ordinal, side='left') if start is not None else 0
+        hi = np.searchsorted(self.ordinals, end.to_period(self.freq).ordinal, side='right') if end is not None else len(self)
+        return int(lo), int(max(lo, hi))
+
+class RollupPyramid:
+    """Weekly, monthly and season rollups of every column of a date-indexed frame
+
+    Seasons are folded from the monthly level when rebuilding, so a rebuild
+    reads the daily rows twice. Appended days are folded into the last bucket
+    of each level or open a new one, in O(new rows) per level.
+    """
+
+    def __init__(self, df):
+        self.rebuild(df)
+
+    def rebuild(self, df):
+        """Aggregate every level from the daily rows"""
+        self.columns = list(df.columns)
+        self.days = len(df)
+        self.levels = {name: RollupLevel(freq, len(self.columns)) for name, freq in ROLLUP_FREQS.items()}
+
+        dates, values, ones = self._rows(df)
+        for name in ('W', 'M'):
+            level = self.levels[name]
+            level.fold(level.ordinals_of(df.index), dates, ones, values, values, values)
+
+        month, season = self.levels['M'], self.levels['season']
+        season.fold(season.ordinals_of(pd.DatetimeIndex(month.first)), month.first, month.count, month.sum, month.min, month.max)
+
+    def append(self, df, n_new):
+        """Fold the last n_new rows of df (already appended) into every level"""
+        if list(df.columns) != self.columns or len(df) != self.days + n_new:
+            self.rebuild(df)
+            return
+
+        new_rows = df.iloc[-n_new:]
+        dates, values, ones = self._rows(new_rows)
+        for level in self.levels.values():
+            level.fold(level.ordinals_of(new_rows.index), dates, ones, values, values, values)
+        self.days += n_new
+
+    @staticmethod
+    def _rows(df):
+        return df.index.to_numpy().astype('datetime64[ns]'), df.to_numpy(dtype=float), np.ones(len(df), dtype=np.int64)
+
+    def query(self, freq, metrics=None, stats=ROLLUP_STATS, start=None, end=None):
+        """Rows of the freq level overlapping start..end with the requested stats per metric"""
+        level = self.levels[freq]
+        metrics = metrics or self.columns
+        columns = [self.columns.index(metric) for metric in metrics]
+        lo, hi = level.bounds(start, end)
+
+        periods = pd.DatetimeIndex(level.first[lo:hi]).to_period(level.freq)
+        count = level.count[lo:hi]
+        selected = {
+            'sum': level.sum[lo:hi, columns],
+            'mean': level.sum[lo:hi, columns] / np.maximum(count, 1)[:, None],
+            'min': level.min[lo:hi, columns],
+            'max': level.max[lo:hi, columns]
+        }
+        stat_values = {stat: selected[stat].tolist() for stat in stats}
+
+        rows = []
+        for i, period in enumerate(periods):
+            row = {
+                'period': str(period),
+                'start': period.start_time.strftime('%Y-%m-%d'),
+                'end': period.end_time.strftime('%Y-%m-%d'),
+                'days': int(count[i])
+            }
+            for j, metric in enumerate(metrics):
+                row[metric] = {stat: stat_values[stat][i][j] for stat in stats}
+            rows.append(row)
+        return rows
+
+def parse_rollup_query(args, columns):
+    """Validate /timeseries/rollup args into keyword arguments for RollupPyramid.query"""
+    freq = args.get('freq', 'M')
+    if freq not in ROLLUP_FREQS:
+        raise QueryError(f"freq must be one of {list(ROLLUP_FREQS)}")
+
+    metrics = parse_metrics(args, columns)
+    stats = [stat for stat in args.get('stats', '').split(',') if stat] or list(ROLLUP_STATS)
+    unknown = [stat for stat in stats if stat not in ROLLUP_STATS]
+    if unknown:
+        raise QueryError(f"Unknown stats {unknown}; available: {list(ROLLUP_STATS)}")
+
+    start = parse_date('start', args['start']) if args.get('start') else None
+    end = parse_date('end', args['end']) if args.get('end') else None
+    if start is not None and end is not None and start > end:
+        raise QueryError("start must not be after end")
+    return {'freq': freq, 'metrics': metrics, 'stats': stats, 'start': start, 'end': end}
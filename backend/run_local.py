@@ -23,14 +23,13 @@ if __name__ == '__main__':
             print("Continuing without model...")
     
     # Check if data exists
-    if not os.path.exists('data/volleyball_data.csv'):
+    from column_store import save_table, table_available
+    if not table_available('volleyball_data'):
         print("📊 Creating sample data...")
         try:
             from train_model import create_sample_data
-            import pandas as pd
             df = create_sample_data()
-            os.makedirs('data', exist_ok=True)
-            df.to_csv('data/volleyball_data.csv', index=False)
+            save_table(df, 'volleyball_data')
             print("✅ Sample data created")
         except Exception as e:
             print(f"❌ Error creating data: {e}")
@@ -0,0 +1,157 @@
+# AVP Beach Volleyball Analytics Platform - Shared Memory
+# Read-only arrays in memory-mapped segments so every gunicorn worker maps the same copy
+
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from column_store import DATA_DIR
+
+def _default_dir():
+    """tmpfs when available, so segments live in RAM and are shared through the page cache
+
+    The directory is named after the data directory, so a second deployment or a
+    benchmark on the same host never prunes the segments of another.
+    """
+    if not os.path.isdir('/dev/shm'):
+        return os.path.join(DATA_DIR, 'shared')
+    deployment = hashlib.blake2b(os.path.abspath(DATA_DIR).encode(), digest_size=6).hexdigest()
+    return os.path.join('/dev/shm', f"avp-analytics-{deployment}")
+
+SHARED_MEMORY = os.environ.get('SHARED_MEMORY', '1') == '1'
+SHARED_DIR = os.environ.get('SHARED_DIR') or _default_dir()
+
+ALIGNMENT = 64
+SEGMENT_SUFFIX = '.seg'
+
+# pandas < 3 copies on concat unless told not to; 3.x never copies eagerly and deprecates the keyword
+_NO_COPY = {} if int(pd.__version__.split('.')[0]) >= 3 else {'copy': False}
+
+# Current segment mapped by this process per name: name -> bytes
+_attached = {}
+
+def _digest(arrays, extra):
+    """Content hash naming a segment, so workers holding the same data share one file"""
+    digest = hashlib.blake2b(json.dumps(extra, sort_keys=True).encode(), digest_size=8)
+    for key, array in arrays:
+        digest.update(f"{key}|{array.dtype.str}|{array.shape}|".encode())
+        digest.update(np.ascontiguousarray(array).view(np.uint8).data)
+    return digest.hexdigest()
+
+def _write_segment(path, arrays, extra):
+    """Write arrays back to back at aligned offsets; the .json layout written last is the commit point"""
+    entries = []
+    offset = 0
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        for key, array in arrays:
+            offset += -offset % ALIGNMENT
+            f.seek(offset)
+            array = np.ascontiguousarray(array)
+            f.write(array.view(np.uint8).data)
+            entries.append({'key': key, 'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset})
+            offset += array.nbytes
+    os.replace(tmp_path, path)
+
+    layout_path = f"{path}.json"
+    with open(f"{layout_path}.{os.getpid()}.tmp", 'w') as f:
+        json.dump({'entries': entries, 'bytes': offset, **extra}, f)
+    os.replace(f"{layout_path}.{os.getpid()}.tmp", layout_path)
+
+def _attach_segment(path):
+    """Map a segment read-only, returning (arrays by key, layout)"""
+    with open(f"{path}.json") as f:
+        layout = json.load(f)
+    arrays = {}
+    if layout['bytes']:
+        buffer = np.memmap(path, dtype=np.uint8, mode='r', shape=(layout['bytes'],))
+        for entry in layout['entries']:
+            dtype = np.dtype(entry['dtype'])
+            count = int(np.prod(entry['shape']))
+            arrays[entry['key']] = buffer[entry['offset']:entry['offset'] + count * dtype.itemsize].view(dtype).reshape(entry['shape'])
+    else:
+        for entry in layout['entries']:
+            arrays[entry['key']] = np.empty(entry['shape'], dtype=entry['dtype'])
+    return arrays, layout
+
+def _prune(name, keep):
+    """Remove older segments of name; processes that still map them keep their pages until they let go"""
+    for filename in os.listdir(SHARED_DIR):
+        path = os.path.join(SHARED_DIR, filename)
+        if filename.startswith(f"{name}-") and not filename.startswith(os.path.basename(keep)):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+def _share(name, arrays, extra):
+    """Map a segment holding arrays, writing it first unless another process already has"""
+    os.makedirs(SHARED_DIR, exist_ok=True)
+    path = os.path.join(SHARED_DIR, f"{name}-{_digest(arrays, extra)}{SEGMENT_SUFFIX}")
+    try:
+        shared, layout = _attach_segment(path)
+    except (OSError, ValueError):
+        _write_segment(path, arrays, extra)
+        _prune(name, path)
+        shared, layout = _attach_segment(path)
+    _attached[name] = layout['bytes']
+    return shared, layout
+
+def _runs(df):
+    """Split columns into runs of one dtype, in column order, so rebuilding the frame needs no reordering"""
+    runs = []
+    for name in df.columns:
+        if runs and df[name].dtype == df[runs[-1][0]].dtype:
+            runs[-1].append(name)
+        else:
+            runs.append([name])
+    return runs
+
+def share_frame(df, name):
+    """Return df backed by a shared read-only segment, or df itself when sharing is off or fails
+
+    Numeric and datetime columns are supported; frames with other dtypes are returned unchanged.
+    """
+    if not SHARED_MEMORY or len(df.columns) == 0:
+        return df
+    if any(not (pd.api.types.is_numeric_dtype(dtype) or pd.api.types.is_datetime64_dtype(dtype)) for dtype in df.dtypes):
+        return df
+
+    runs = _runs(df)
+    arrays = [('index', df.index.to_numpy())]
+    arrays += [(f"run{i}", df[run].to_numpy().T) for i, run in enumerate(runs)]
+    try:
+        shared, layout = _share(name, arrays, {'runs': [list(map(str, run)) for run in runs], 'index_name': df.index.name})
+    except OSError as e:
+        print(f"⚠️  Shared memory unavailable ({SHARED_DIR}): {e}")
+        return df
+
+    # Each run's rows are the columns of one block, so the frame is built from views without copying
+    pieces = [pd.DataFrame(shared[f"run{i}"].T, columns=run, copy=False) for i, run in enumerate(runs)]
+    frame = pd.concat(pieces, axis=1, **_NO_COPY) if len(pieces) > 1 else pieces[0]
+    frame.columns = df.columns
+    frame.index = pd.Index(shared['index'], name=df.index.name, copy=False)
+    return frame
+
+def share_arrays(arrays, name):
+    """Return {key: read-only shared view} for a dict of arrays, or the arrays themselves when sharing is off or fails"""
+    if not SHARED_MEMORY or not arrays:
+        return arrays
+    try:
+        shared, _ = _share(name, [(key, np.asarray(array)) for key, array in arrays.items()], {})
+    except OSError as e:
+        print(f"⚠️  Shared memory unavailable ({SHARED_DIR}): {e}")
+        return arrays
+    return shared
+
+def describe():
+    """Shared segments mapped by this process"""
+    return {
+        'enabled': SHARED_MEMORY,
+        'directory': SHARED_DIR,
+        'segments': len(_attached),
+        'bytes': sum(_attached.values())
+    }
@@ -0,0 +1,143 @@
+# AVP Beach Volleyball Analytics Platform - Monte Carlo Simulation
+# Vectorized forecast-path simulation mapped to match and season win probabilities
+
+import os
+
+import numpy as np
+import pandas as pd
+
+SIMULATION_PATHS = int(os.environ.get('SIMULATION_PATHS', 10000))
+SIMULATION_MAX_PATHS = int(os.environ.get('SIMULATION_MAX_PATHS', 200000))
+SIMULATION_CHUNK_PATHS = int(os.environ.get('SIMULATION_CHUNK_PATHS', 5000))  # Paths held in memory at once
+SIMULATION_SEED = 42
+SIMULATION_MAX_DAYS = 365
+
+# Paths drawn from one random stream; results depend on the seed, never on the chunk size
+PATH_BLOCK = 1000
+PROBABILITY_BINS = 1000
+
+# Efficiency bounds of the data generator, applied to simulated paths as well
+EFFICIENCY_BOUNDS = (0.3, 0.95)
+
+def _matrix_sqrt(cov):
+    """Factor L with L @ L.T == cov for a possibly singular covariance"""
+    values, vectors = np.linalg.eigh((cov + cov.T) / 2)
+    return vectors * np.sqrt(np.clip(values, 0, None))
+
+def simulate_paths(forecaster, steps, n_paths, rng):
+    """(n_paths, steps) draws of future observations from a forecaster's state-space model
+
+    Paths start from the filtered state distribution and propagate state and
+    observation noise one step at a time for all paths together, so the only
+    Python loop is over the horizon.
+    """
+    state_sqrt = _matrix_sqrt(forecaster.state_cov)
+    disturbance_sqrt = _matrix_sqrt(forecaster.disturbance_cov)
+    obs_sd = np.sqrt(max(forecaster.obs_cov[0, 0], 0.0))
+    noise_map = (forecaster.selection @ disturbance_sqrt).T
+
+    state = forecaster.state + rng.standard_normal((n_paths, len(forecaster.state))) @ state_sqrt.T
+    paths = np.empty((n_paths, steps))
+    for step in range(steps):
+        paths[:, step] = state @ forecaster.design[0] + forecaster.obs_intercept[0] + obs_sd * rng.standard_normal(n_paths)
+        state = state @ forecaster.transition.T + forecaster.state_intercept + rng.standard_normal((n_paths, disturbance_sqrt.shape[1])) @ noise_map
+    return paths
+
+def _histogram_quantiles(counts, quantiles, values):
+    """Per-row quantiles of values from counts of shape (rows, len(values))"""
+    cumulative = np.cumsum(counts, axis=1)
+    totals = cumulative[:, -1:]
+    return [values[np.argmax(cumulative >= np.maximum(q * totals, 1), axis=1)] for q in quantiles]
+
+def simulate_wins(forecaster_a, forecaster_b, steps=30, n_paths=SIMULATION_PATHS, seed=SIMULATION_SEED,
+                  alpha=0.1, chunk_paths=SIMULATION_CHUNK_PATHS):
+    """Win probabilities and expected wins for team A over the next steps days
+
+    Each path draws both efficiency series; team A wins a day with probability
+    eff_a / (eff_a + eff_b) and the match outcome is drawn as well. Paths are
+    processed in chunks and summarized into running sums and histograms, so
+    memory is bounded by chunk_paths whatever n_paths is.
+    """
+    chunk_blocks = max(chunk_paths // PATH_BLOCK, 1)
+    n_blocks = -(-n_paths // PATH_BLOCK)
+
+    probability_sum = np.zeros(steps)
+    wins_sum = np.zeros(steps)
+    probability_counts = np.zeros(steps * PROBABILITY_BINS, dtype=np.int64)
+    wins_counts = np.zeros(steps * (steps + 1), dtype=np.int64)
+    step_offsets = np.arange(steps)
+    majority = 0
+
+    for first_block in range(0, n_blocks, chunk_blocks):
+        probabilities = []
+        outcomes = []
+        for block in range(first_block, min(first_block + chunk_blocks, n_blocks)):
+            size = min(PATH_BLOCK, n_paths - block * PATH_BLOCK)
+            rng = np.random.RandomState([seed, block])
+            efficiency_a = np.clip(simulate_paths(forecaster_a, steps, size, rng), *EFFICIENCY_BOUNDS)
+            efficiency_b = np.clip(simulate_paths(forecaster_b, steps, size, rng), *EFFICIENCY_BOUNDS)
+            probability = efficiency_a / (efficiency_a + efficiency_b)
+            probabilities.append(probability)
+            outcomes.append(rng.random_sample(probability.shape) < probability)
+
+        probability = np.concatenate(probabilities)
+        cumulative_wins = np.cumsum(np.concatenate(outcomes), axis=1)
+
+        probability_sum += probability.sum(axis=0)
+        wins_sum += cumulative_wins.sum(axis=0)
+        bins = np.minimum((probability * PROBABILITY_BINS).astype(np.int64), PROBABILITY_BINS - 1)
+        probability_counts += np.bincount((step_offsets * PROBABILITY_BINS + bins).ravel(), minlength=len(probability_counts))
+        wins_counts += np.bincount((step_offsets * (steps + 1) + cumulative_wins).ravel(), minlength=len(wins_counts))
+        majority += int((cumulative_wins[:, -1] * 2 > steps).sum())
+
+    quantiles = (alpha / 2, 1 - alpha / 2)
+    probability_lower, probability_upper = _histogram_quantiles(
+        probability_counts.reshape(steps, PROBABILITY_BINS), quantiles, (np.arange(PROBABILITY_BINS) + 0.5) / PROBABILITY_BINS)
+    wins_lower, wins_upper = _histogram_quantiles(wins_counts.reshape(steps, steps + 1), quantiles, np.arange(steps + 1))
+
+    dates = pd.date_range(forecaster_a.next_date, periods=steps, freq='D').strftime('%Y-%m-%d')
+    daily = [
+        {
+            'date': date,
+            'win_probability': round(float(probability_sum[i] / n_paths), 4),
+            'probability_lower': round(float(probability_lower[i]), 4),
+            'probability_upper': round(float(probability_upper[i]), 4),
+            'expected_wins': round(float(wins_sum[i] / n_paths), 3),
+            'wins_lower': int(wins_lower[i]),
+            'wins_upper': int(wins_upper[i])
+        }
+        for i, date in enumerate(dates)
+    ]
+
+    return {
+        'horizon_days': steps,
+        'paths': n_paths,
+        'seed': seed,
+        'confidence': 1 - alpha,
+        'expected_wins': daily[-1]['expected_wins'],
+        'wins_band': [daily[-1]['wins_lower'], daily[-1]['wins_upper']],
+        'majority_probability': round(majority / n_paths, 4),
+        'daily': daily
+    }
+
+def parse_simulation_args(args):
+    """Validate ?days=&paths=&seed=&alpha= into keyword arguments for simulate_wins"""
+    try:
+        options = {
+            'steps': int(args.get('days', 30)),
+            'n_paths': int(args.get('paths', SIMULATION_PATHS)),
+            'seed': int(args.get('seed', SIMULATION_SEED)),
+            'alpha': float(args.get('alpha', 0.1))
+        }
+    except ValueError:
+        raise ValueError("days, paths and seed must be integers and alpha a number")
+
+    if not 1 <= options['steps'] <= SIMULATION_MAX_DAYS:
+        raise ValueError(f"days must be between 1 and {SIMULATION_MAX_DAYS}")
+    if not 1 <= options['n_paths'] <= SIMULATION_MAX_PATHS:
+        raise ValueError(f"paths must be between 1 and {SIMULATION_MAX_PATHS}")
+    if not 0 <= options['seed'] < 2 ** 32:
+        raise ValueError("seed must be between 0 and 2**32 - 1")
+    if not 0 < options['alpha'] < 1:
+        raise ValueError("alpha must be between 0 and 1")
+    return options
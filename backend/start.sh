@@ -6,16 +6,18 @@ echo "🚀 Starting AVP Beach Volleyball Analytics ML System..."
 echo "📦 Installing Python dependencies..."
 pip install -r requirements.txt
 
-# Initialize ML system
-echo "🤖 Initializing ML system..."
-python -c "
-import sys
-sys.path.append('.')
-from api import initialize_ml_system
-initialize_ml_system()
-print('✅ ML system initialized successfully!')
-"
+# Pre-bake the ARIMA model cache
+echo "🤖 Warming ARIMA model cache..."
+python model_cache.py
 
-# Start the application
+# Worker metric snapshots from a previous run would otherwise be summed into /metrics
+if [ -n "$METRICS_DIR" ]; then
+    rm -rf "$METRICS_DIR"
+fi
+
+# Start the application; --preload loads the data and models once in the master,
+# and workers share the dataset and forecast arrays instead of holding a copy each.
+# Writes (/observations) are refused with more than one worker, so keep the default of 1
+# for deployments that append data.
 echo "🌐 Starting Flask application..."
-exec gunicorn --bind 0.0.0.0:$PORT --workers 1 --timeout 300 api:app 
\ No newline at end of file
+exec gunicorn --bind 0.0.0.0:$PORT --workers ${WEB_CONCURRENCY:-1} --preload --timeout 300 api:app 
\ No newline at end of file
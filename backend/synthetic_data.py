@@ -0,0 +1,284 @@
+# AVP Beach Volleyball Analytics Platform - Synthetic Workloads
+# Vectorized, seeded generators for volleyball data of any size, streamed in chunks
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+TIMESERIES_START = '2023-01-01'
+MATCHES_START = '2022-01-01'
+SEASON_DAYS = 365
+CHUNK_ROWS = 100000  # Rows held in memory at once when streaming
+
+# Rows (or entities) drawn from one random stream, so streamed output does not depend on chunk size
+ROW_BLOCK = 10000
+ENTITY_BLOCK = 256
+
+# Per-entity metrics the entity generator can produce
+ENTITY_METRICS = ['kills', 'efficiency', 'wins', 'digs', 'errors', 'aces']
+
+def _check_days(n_days, start):
+    """Refuse histories that run past the last date pandas can represent"""
+    max_days = (pd.Timestamp.max - pd.Timestamp(start)).days
+    if n_days > max_days:
+        raise ValueError(f"{n_days} days from {start} exceed the supported date range ({max_days} days); "
+                         f"scale with more teams or matches per day instead")
+
+def _team_series(rng, t, season_days=SEASON_DAYS):
+    """Two-team kills, efficiency and wins for absolute day numbers t"""
+    n = len(t)
+    seasonal_pattern = 5 * np.sin(2 * np.pi * t / season_days)  # Seasonal cycle
+    weekly_pattern = 2 * np.sin(2 * np.pi * t / 7)             # Weekly pattern
+    trend = 0.02 * t  # Slight upward trend
+    noise = rng.normal(0, 2, n)
+
+    # Team A improves over time, team B is more volatile
+    team_a_kills = np.maximum(20 + seasonal_pattern + weekly_pattern + trend + noise, 5)
+    team_b_kills = np.maximum(20 + seasonal_pattern + weekly_pattern + 0.5 * trend + 1.5 * noise, 5)
+
+    team_a_efficiency = 0.7 + 0.1 * np.sin(2 * np.pi * t / 30) + 0.01 * trend + 0.05 * rng.normal(0, 1, n)
+    team_a_efficiency = np.clip(team_a_efficiency, 0.3, 0.95)
+    team_b_efficiency = 0.65 + 0.08 * np.sin(2 * np.pi * t / 30) + 0.005 * trend + 0.08 * rng.normal(0, 1, n)
+    team_b_efficiency = np.clip(team_b_efficiency, 0.3, 0.95)
+
+    # Win probability based on relative efficiency, drawn for every day at once
+    team_a_wins = rng.binomial(1, team_a_efficiency / (team_a_efficiency + team_b_efficiency))
+
+    return pd.DataFrame({
+        'team_a_kills': np.round(team_a_kills, 1),
+        'team_b_kills': np.round(team_b_kills, 1),
+        'team_a_efficiency': np.round(team_a_efficiency, 3),
+        'team_b_efficiency': np.round(team_b_efficiency, 3),
+        'team_a_wins': team_a_wins,
+        'total_kills': np.round(team_a_kills + team_b_kills, 1),
+        'kill_difference': np.round(team_a_kills - team_b_kills, 1)
+    })
+
+def generate_timeseries(n_days=365, seed=42, start=TIMESERIES_START, seasons=None):
+    """Daily two-team time series indexed by date, as used by the ARIMA API
+
+    seasons splits the history into that many seasonal cycles; by default a
+    season lasts a year.
+    """
+    _check_days(n_days, start)
+    season_days = n_days / seasons if seasons else SEASON_DAYS
+    frame = _team_series(np.random.RandomState(seed), np.arange(n_days), season_days)
+    frame.index = pd.date_range(start, periods=n_days, freq='D', name='date')
+    return frame
+
+def _grouped(frames, chunk_rows):
+    """Concatenate consecutive frames into chunks of at least chunk_rows rows"""
+    pending = []
+    size = 0
+    for frame in frames:
+        pending.append(frame)
+        size += len(frame)
+        if size >= chunk_rows:
+            yield pd.concat(pending) if len(pending) > 1 else pending[0]
+            pending = []
+            size = 0
+    if pending:
+        yield pd.concat(pending) if len(pending) > 1 else pending[0]
+
+def _timeseries_blocks(n_days, seed, start, season_days):
+    """Fixed-size blocks of the two-team series, each from its own random stream"""
+    start = pd.Timestamp(start)
+    for block, first in enumerate(range(0, n_days, ROW_BLOCK)):
+        t = np.arange(first, min(first + ROW_BLOCK, n_days))
+        frame = _team_series(np.random.RandomState([seed, block]), t, season_days)
+        frame.index = pd.DatetimeIndex(start + pd.to_timedelta(t, unit='D'), name='date')
+        yield frame
+
+def iter_timeseries_chunks(n_days, seed=42, start=TIMESERIES_START, seasons=None, chunk_rows=CHUNK_ROWS):
+    """Yield the two-team series in date order, about chunk_rows days at a time"""
+    _check_days(n_days, start)
+    season_days = n_days / seasons if seasons else SEASON_DAYS
+    return _grouped(_timeseries_blocks(n_days, seed, start, season_days), chunk_rows)
+
+def generate_matches(n_samples=300, seed=42, start=MATCHES_START, matches_per_day=1, offset=0):
+    """Match-level box scores with scores and winners, as used by data cleaning
+
+    offset is the number of earlier matches, so streamed blocks continue the dates.
+    """
+    rng = np.random.RandomState(seed)
+    match_days = (offset + np.arange(n_samples)) // matches_per_day
+
+    # Generate realistic volleyball match data
+    df = pd.DataFrame({
+        'match_date': pd.Timestamp(start) + pd.to_timedelta(match_days, unit='D'),
+        'team_a_total_kills': rng.randint(10, 35, n_samples),
+        'team_a_total_digs': rng.randint(15, 40, n_samples),
+        'team_a_total_errors': rng.randint(2, 15, n_samples),
+        'team_a_total_aces': rng.randint(0, 8, n_samples),
+        'team_b_total_kills': rng.randint(10, 35, n_samples),
+        'team_b_total_digs': rng.randint(15, 40, n_samples),
+        'team_b_total_errors': rng.randint(2, 15, n_samples),
+        'team_b_total_aces': rng.randint(0, 8, n_samples),
+        'team_a_kill_efficiency': rng.uniform(0.4, 0.95, n_samples),
+        'team_b_kill_efficiency': rng.uniform(0.4, 0.95, n_samples)
+    })
+
+    # Performance-based scoring with realistic variability
+    for team in ('team_a', 'team_b'):
+        df[f'{team}_score'] = (
+            df[f'{team}_total_kills'] * 0.4 +
+            df[f'{team}_total_aces'] * 0.3 +
+            df[f'{team}_kill_efficiency'] * 25 -
+            df[f'{team}_total_errors'] * 0.2
+        )
+    df['team_a_score'] += rng.normal(0, 3, n_samples)
+    df['team_b_score'] += rng.normal(0, 3, n_samples)
+
+    # Determine winners and derived features
+    df['winner'] = np.where(df['team_a_score'] > df['team_b_score'], 'Team A', 'Team B')
+    df['winner_binary'] = np.where(df['winner'] == 'Team A', 1, 0)
+    df['total_kills'] = df['team_a_total_kills'] + df['team_b_total_kills']
+    df['kill_difference'] = df['team_a_total_kills'] - df['team_b_total_kills']
+    df['efficiency_difference'] = df['team_a_kill_efficiency'] - df['team_b_kill_efficiency']
+
+    return df
+
+def iter_match_chunks(n_samples, seed=42, start=MATCHES_START, matches_per_day=1, chunk_rows=CHUNK_ROWS):
+    """Yield match rows in date order, about chunk_rows matches at a time"""
+    _check_days(-(-n_samples // matches_per_day), start)
+    blocks = (
+        generate_matches(min(ROW_BLOCK, n_samples - first), seed=[seed, block], start=start,
+                         matches_per_day=matches_per_day, offset=first)
+        for block, first in enumerate(range(0, n_samples, ROW_BLOCK))
+    )
+    return (chunk.reset_index(drop=True) for chunk in _grouped(blocks, chunk_rows))
+
+def _entity_block(rng, codes, n_days, metrics, season_days):
+    """Long-format rows for a block of entities over n_days, entity-major"""
+    n_entities = len(codes)
+    t = np.arange(n_days)
+    season = t // season_days
+
+    # Every entity has a base skill that drifts from one season to the next
+    n_seasons = int(season[-1]) + 1 if n_days else 0
+    skill = rng.normal(0, 1, (n_entities, 1)) + np.cumsum(rng.normal(0, 0.3, (n_entities, n_seasons)), axis=1)[:, season]
+    seasonal = np.sin(2 * np.pi * (t % season_days) / season_days)
+    weekly = np.sin(2 * np.pi * t / 7)
+
+    shape = (n_entities, n_days)
+    efficiency = np.clip(0.68 + 0.05 * skill + 0.05 * seasonal + 0.06 * rng.normal(0, 1, shape), 0.3, 0.95)
+    kills = np.maximum(20 + 3 * skill + 4 * seasonal + 1.5 * weekly + rng.normal(0, 2.5, shape), 5)
+
+    columns = {}
+    for metric in metrics:
+        if metric == 'kills':
+            columns[metric] = np.round(kills, 1)
+        elif metric == 'efficiency':
+            columns[metric] = np.round(efficiency, 3)
+        elif metric == 'wins':
+            # Against an average opponent
+            columns[metric] = rng.binomial(1, efficiency / (efficiency + 0.68))
+        elif metric == 'digs':
+            columns[metric] = rng.poisson(np.maximum(27 + 2 * skill + 2 * weekly, 1))
+        elif metric == 'errors':
+            columns[metric] = rng.poisson(np.maximum(8 - 1.5 * skill, 0.5))
+        elif metric == 'aces':
+            columns[metric] = rng.poisson(np.maximum(3 + 0.5 * skill, 0.1))
+
+    return {metric: values.ravel() for metric, values in columns.items()}
+
+def iter_entity_chunks(n_entities, n_days=365, seasons=1, metrics=None, seed=42,
+                       start=TIMESERIES_START, chunk_rows=CHUNK_ROWS):
+    """Yield long-format entity, date and metric rows, whole entities at a time
+
+    The columns match data/entity_timeseries.csv.
+    """
+    _check_days(n_days, start)
+    metrics = metrics or ['kills', 'efficiency', 'wins']
+    unknown = [metric for metric in metrics if metric not in ENTITY_METRICS]
+    if unknown:
+        raise ValueError(f"Unknown entity metrics {unknown}; choose from {ENTITY_METRICS}")
+    season_days = max(n_days // seasons, 1)
+    dates = pd.date_range(start, periods=n_days, freq='D').to_numpy()
+    width = len(str(max(n_entities - 1, 0)))
+
+    def blocks():
+        for block, first in enumerate(range(0, n_entities, ENTITY_BLOCK)):
+            codes = np.arange(first, min(first + ENTITY_BLOCK, n_entities))
+            values = _entity_block(np.random.RandomState([seed, block]), codes, n_days, metrics, season_days)
+            yield pd.DataFrame({
+                'entity': np.repeat(np.char.add('team_', np.char.zfill(codes.astype(str), width)), n_days),
+                'date': np.tile(dates, len(codes)),
+                **values
+            })
+
+    return (chunk.reset_index(drop=True) for chunk in _grouped(blocks(), chunk_rows))
+
+def write_chunks(chunks, path):
+    """Stream DataFrame chunks to a .csv or .parquet file and return the row count"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    parquet = path.endswith('.parquet')
+    if parquet:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+    rows = 0
+    writer = None
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        for chunk in chunks:
+            # Date indexes are written as a regular column
+            if chunk.index.name is not None:
+                chunk = chunk.reset_index()
+            if parquet:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(tmp_path, table.schema)
+                writer.write_table(table)
+            else:
+                chunk.to_csv(tmp_path, mode='a' if rows else 'w', header=not rows, index=False)
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    os.replace(tmp_path, path)
+    return rows
+
+def main():
+    """Generate a synthetic dataset for load and performance testing"""
+    parser = argparse.ArgumentParser(description="Generate seeded synthetic volleyball data")
+    parser.add_argument('kind', choices=['timeseries', 'matches', 'entities'],
+                        help="two-team daily series, match box scores, or per-team long format")
+    parser.add_argument('--days', type=int, default=365, help="days of history (timeseries, entities)")
+    parser.add_argument('--matches', type=int, default=300, help="number of matches (matches)")
+    parser.add_argument('--matches-per-day', type=int, default=1, help="matches played on each date (matches)")
+    parser.add_argument('--teams', type=int, default=100, help="number of teams (entities)")
+    parser.add_argument('--seasons', type=int, default=1, help="seasons the history is split into")
+    parser.add_argument('--metrics', default='kills,efficiency,wins', help=f"entity metrics from {','.join(ENTITY_METRICS)}")
+    parser.add_argument('--seed', type=int, default=42, help="random seed")
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS, help="rows generated per chunk")
+    parser.add_argument('--output', required=True, help="destination .csv or .parquet file")
+    args = parser.parse_args()
+
+    try:
+        if args.kind == 'timeseries':
+            chunks = iter_timeseries_chunks(args.days, seed=args.seed, seasons=args.seasons, chunk_rows=args.chunk_rows)
+        elif args.kind == 'matches':
+            chunks = iter_match_chunks(args.matches, seed=args.seed, matches_per_day=args.matches_per_day, chunk_rows=args.chunk_rows)
+        else:
+            chunks = iter_entity_chunks(args.teams, n_days=args.days, seasons=args.seasons, metrics=args.metrics.split(','),
+                                        seed=args.seed, chunk_rows=args.chunk_rows)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    print(f"📊 Generating {args.kind} data...")
+    start = time.perf_counter()
+    rows = write_chunks(chunks, args.output)
+    seconds = time.perf_counter() - start
+
+    print(f"✅ Wrote {rows:,} rows to {args.output} in {seconds:.2f}s ({rows / seconds:,.0f} rows/s)")
+    print(f"📊 File size: {os.path.getsize(args.output) / 1024 / 1024:.1f} MB")
+
+if __name__ == "__main__":
+    main()
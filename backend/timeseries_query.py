@@ -0,0 +1,110 @@
+# AVP Beach Volleyball Analytics Platform - Time Series Queries
+# Date-range, column-projected and cursor-paginated reads of date-indexed frames, streamed as NDJSON when large
+
+import json
+import os
+
+import pandas as pd
+
+TIMESERIES_PAGE_SIZE = int(os.environ.get('TIMESERIES_PAGE_SIZE', 1000))
+TIMESERIES_MAX_PAGE_SIZE = int(os.environ.get('TIMESERIES_MAX_PAGE_SIZE', 10000))
+STREAM_CHUNK_ROWS = 5000  # Rows serialized at a time when streaming, which bounds memory per response
+
+QUERY_PARAMS = ('start', 'end', 'metrics', 'cursor', 'limit', 'format')
+FORMATS = ('json', 'ndjson')
+
+class QueryError(ValueError):
+    """A query parameter that cannot be answered; reported to the client as a 400"""
+
+def parse_date(name, value):
+    """Parse a date parameter, naming it in the error; times with an offset are converted to naive UTC"""
+    try:
+        date = pd.Timestamp(value)
+    except (ValueError, TypeError):
+        raise QueryError(f"{name} must be a date (YYYY-MM-DD), got {value!r}")
+    if date is pd.NaT:
+        raise QueryError(f"{name} must be a date (YYYY-MM-DD), got {value!r}")
+    # The index is tz-naive, and searchsorted cannot compare it with an aware timestamp
+    return date.tz_convert(None) if date.tzinfo is not None else date
+
+def parse_metrics(args, columns):
+    """Comma-separated ?metrics=, defaulting to every column"""
+    metrics = [metric for metric in args.get('metrics', '').split(',') if metric] or list(columns)
+    unknown = [metric for metric in metrics if metric not in columns]
+    if unknown:
+        raise QueryError(f"Unknown metrics {unknown}; available: {list(columns)}")
+    return metrics
+
+def parse_query(args, columns):
+    """Validate request args into a query dict; column names are checked against columns"""
+    metrics = parse_metrics(args, columns)
+
+    try:
+        limit = int(args.get('limit', TIMESERIES_PAGE_SIZE))
+    except ValueError:
+        raise QueryError("limit must be an integer")
+    if not 1 <= limit <= TIMESERIES_MAX_PAGE_SIZE:
+        raise QueryError(f"limit must be between 1 and {TIMESERIES_MAX_PAGE_SIZE}")
+
+    output = args.get('format', 'json')
+    if output not in FORMATS:
+        raise QueryError(f"format must be one of {list(FORMATS)}")
+
+    query = {
+        'start': parse_date('start', args['start']) if args.get('start') else None,
+        'end': parse_date('end', args['end']) if args.get('end') else None,
+        'cursor': parse_date('cursor', args['cursor']) if args.get('cursor') else None,
+        'metrics': metrics,
+        'limit': limit,
+        'format': output
+    }
+    if query['start'] is not None and query['end'] is not None and query['start'] > query['end']:
+        raise QueryError("start must not be after end")
+    return query
+
+def row_bounds(index, query):
+    """Positions [lo, hi) of the rows in the query's date range, by binary search on the sorted index"""
+    lo = index.searchsorted(query['start'], side='left') if query['start'] is not None else 0
+    hi = index.searchsorted(query['end'], side='right') if query['end'] is not None else len(index)
+    if query['cursor'] is not None:
+        # The cursor is the date of the first row not yet returned, so pages stay stable as rows are appended
+        lo = max(lo, index.searchsorted(query['cursor'], side='left'))
+    return int(lo), int(max(lo, hi))
+
+def records(df, metrics, lo, hi):
+    """Rows lo:hi of the projected columns as a list of dicts with an ISO date"""
+    dates = df.index[lo:hi].strftime('%Y-%m-%d').tolist()
+    columns = [df[metric].to_numpy()[lo:hi].tolist() for metric in metrics]
+    return [{'date': date, **dict(zip(metrics, values))} for date, *values in zip(dates, *columns)]
+
+def query_page(df, query):
+    """One page of the query as a JSON-ready payload with the cursor of the next page"""
+    lo, hi = row_bounds(df.index, query)
+    page_end = min(hi, lo + query['limit'])
+
+    return {
+        "timeseries_data": records(df, query['metrics'], lo, page_end),
+        "metrics": query['metrics'],
+        "total_observations": len(df),
+        "range": {
+            "start": query['start'].strftime('%Y-%m-%d') if query['start'] is not None else None,
+            "end": query['end'].strftime('%Y-%m-%d') if query['end'] is not None else None,
+            "remaining_rows": hi - lo
+        },
+        "next_cursor": df.index[page_end].strftime('%Y-%m-%d') if page_end < hi else None
+    }
+
+def stream_ndjson(df, query):
+    """Yield every row in the query's range as newline-delimited JSON, STREAM_CHUNK_ROWS rows at a time
+
+    The limit does not apply: the whole range streams with memory bounded by the chunk size.
+    """
+    lo, hi = row_bounds(df.index, query)
+    for chunk_start in range(lo, hi, STREAM_CHUNK_ROWS):
+        rows = records(df, query['metrics'], chunk_start, min(hi, chunk_start + STREAM_CHUNK_ROWS))
+        yield ''.join(json.dumps(row) + '\n' for row in rows)
+
+def cache_key(query):
+    """Stable key for a JSON page, for the response cache"""
+    parts = [query[name].isoformat() if query[name] is not None else '' for name in ('start', 'end', 'cursor')]
+    return ':'.join(parts + [','.join(query['metrics']), str(query['limit'])])
@@ -7,8 +7,14 @@ from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, classification_report
 import joblib
-import os
 from datetime import datetime
+from column_store import load_table, save_table, table_available, table_columns, table_path
+
+FEATURE_COLUMNS = [
+    'team_a_total_kills', 'team_a_total_digs', 'team_a_total_errors', 'team_a_total_aces',
+    'team_b_total_kills', 'team_b_total_digs', 'team_b_total_errors', 'team_b_total_aces',
+    'team_a_kill_efficiency', 'team_b_kill_efficiency'
+]
 
 def create_sample_data():
     """Create sample volleyball data for demonstration"""
@@ -54,11 +60,11 @@ def create_sample_data():
 
 def load_or_create_data():
     """Load existing data or create sample data"""
-    data_path = os.path.join('data', 'volleyball_data.csv')
-    
-    if os.path.exists(data_path):
+    if table_available('volleyball_data'):
         print("📊 Loading existing volleyball data...")
-        df = pd.read_csv(data_path)
+        # Only the model features and the target are read from disk
+        target = 'winner_binary' if 'winner_binary' in table_columns('volleyball_data') else 'winner'
+        df = load_table('volleyball_data', columns=FEATURE_COLUMNS + [target])
         if 'winner_binary' not in df.columns:
             # Add binary target if not present
             df['winner_binary'] = np.where(df['winner'] == 'Team A', 1, 0)
@@ -66,20 +72,14 @@ def load_or_create_data():
         print("📊 Creating sample volleyball data...")
         df = create_sample_data()
         
-        # Create data directory if it doesn't exist
-        os.makedirs('data', exist_ok=True)
-        df.to_csv(data_path, index=False)
-        print(f"✅ Sample data saved to {data_path}")
+        save_table(df, 'volleyball_data')
+        print(f"✅ Sample data saved to {table_path('volleyball_data')}")
     
     return df
 
 def prepare_features(df):
     """Prepare features for machine learning"""
-    feature_columns = [
-        'team_a_total_kills', 'team_a_total_digs', 'team_a_total_errors', 'team_a_total_aces',
-        'team_b_total_kills', 'team_b_total_digs', 'team_b_total_errors', 'team_b_total_aces',
-        'team_a_kill_efficiency', 'team_b_kill_efficiency'
-    ]
+    feature_columns = list(FEATURE_COLUMNS)
     
     X = df[feature_columns]
     y = df['winner_binary']
@@ -141,11 +141,7 @@ def save_model(model, accuracy):
         'accuracy': accuracy,
         'training_date': datetime.now().isoformat(),
         'model_type': 'RandomForestClassifier',
-        'features': [
-            'team_a_total_kills', 'team_a_total_digs', 'team_a_total_errors', 'team_a_total_aces',
-            'team_b_total_kills', 'team_b_total_digs', 'team_b_total_errors', 'team_b_total_aces',
-            'team_a_kill_efficiency', 'team_b_kill_efficiency'
-        ]
+        'features': list(FEATURE_COLUMNS)
     }
     
     joblib.dump(model_info, 'model_info.pkl')
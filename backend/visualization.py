@@ -0,0 +1,123 @@
+# AVP Beach Volleyball Analytics Platform - Visualization Payloads
+# Plotly-compatible figure JSON built from plain dicts, with LTTB downsampling
+
+import json
+import os
+import numpy as np
+
+from metrics import timed
+
+DEFAULT_MAX_POINTS = int(os.environ.get('VIZ_MAX_POINTS', 1000))
+MIN_POINTS = 10
+MAX_POINTS = 20000
+
+# Minimal stand-in for Plotly's plotly_white template so the payload stays small
+PLOTLY_WHITE = {
+    'layout': {
+        'paper_bgcolor': 'white',
+        'plot_bgcolor': 'white',
+        'xaxis': {'gridcolor': '#EBF0F8', 'linecolor': '#EBF0F8', 'zerolinecolor': '#EBF0F8'},
+        'yaxis': {'gridcolor': '#EBF0F8', 'linecolor': '#EBF0F8', 'zerolinecolor': '#EBF0F8'}
+    }
+}
+
+def lttb_indices(x, y, threshold):
+    """Indices of the points kept by Largest-Triangle-Three-Buckets downsampling
+
+    The first and last points are always kept; every bucket in between keeps
+    the point forming the largest triangle with the previously kept point and
+    the average of the next bucket.
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    selected = np.empty(threshold, dtype=int)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_start, next_end = end, edges[bucket + 2] if bucket + 2 < len(edges) else n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        # Twice the triangle area for every candidate in the bucket at once
+        areas = np.abs(
+            (x[previous] - avg_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (avg_y - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+
+    return selected
+
+def clamp_max_points(max_points):
+    """Clamp a requested point budget to the supported range"""
+    if max_points is None:
+        return DEFAULT_MAX_POINTS
+    return max(MIN_POINTS, min(int(max_points), MAX_POINTS))
+
+def create_visualization(series_name, data, forecast_data=None, title="Time Series Analysis", max_points=None):
+    """Create interactive Plotly visualization"""
+    max_points = clamp_max_points(max_points)
+    clean = data.dropna()
+
+    # Downsample on day offsets so uneven spacing is respected
+    day_offsets = (clean.index.asi8 - clean.index.asi8[0]) / 86_400e9 if len(clean) else np.array([])
+    with timed('downsample'):
+        keep = lttb_indices(day_offsets, clean.values, max_points)
+    sampled = clean.iloc[keep]
+
+    traces = [{
+        'type': 'scatter',
+        'x': sampled.index.strftime('%Y-%m-%d').tolist(),
+        'y': sampled.values.tolist(),
+        'mode': 'lines+markers',
+        'name': 'Historical Data',
+        'line': {'color': '#1f77b4', 'width': 2},
+        'marker': {'size': 4}
+    }]
+
+    # Forecast if available
+    if forecast_data:
+        traces.append({
+            'type': 'scatter',
+            'x': forecast_data['dates'],
+            'y': forecast_data['forecast'],
+            'mode': 'lines+markers',
+            'name': 'Forecast',
+            'line': {'color': '#ff7f0e', 'width': 2, 'dash': 'dash'},
+            'marker': {'size': 4}
+        })
+
+        # Confidence intervals
+        traces.append({
+            'type': 'scatter',
+            'x': forecast_data['dates'] + forecast_data['dates'][::-1],
+            'y': forecast_data['upper_ci'] + forecast_data['lower_ci'][::-1],
+            'fill': 'toself',
+            'fillcolor': 'rgba(255, 127, 14, 0.2)',
+            'line': {'color': 'rgba(255, 127, 14, 0)'},
+            'name': 'Confidence Interval',
+            'showlegend': False
+        })
+
+    figure = {
+        'data': traces,
+        'layout': {
+            'title': {'text': title},
+            'xaxis': {'title': {'text': 'Date'}},
+            'yaxis': {'title': {'text': series_name}},
+            'template': PLOTLY_WHITE,
+            'height': 500,
+            'showlegend': True
+        }
+    }
+
+    with timed('plotly_serialization'):
+        return json.dumps(figure, separators=(',', ':'))